@@ -19,7 +19,7 @@ os.chdir(core_path)
 from database import User, engine
 
 # 세션 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """패스워드 검증"""
@@ -70,9 +70,11 @@ def main():
         
         # bcrypt로 직접 검증도 해보기
         print(f"\n=== bcrypt 직접 검증 ===")
+        # 해시 바이트는 후보 패스워드마다 다시 인코딩하지 않고 한 번만 준비
+        hashed_bytes = user.password_hash.encode('utf-8')
         for password in test_passwords:
             try:
-                is_valid = bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8'))
+                is_valid = bcrypt.checkpw(password.encode('utf-8'), hashed_bytes)
                 print(f"  bcrypt 패스워드 '{password}': {'✅ 일치' if is_valid else '❌ 불일치'}")
                 if is_valid:
                     print(f"  🎉 bcrypt로 올바른 패스워드를 찾았습니다: {password}")
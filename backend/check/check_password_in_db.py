@@ -1,30 +1,48 @@
+import re
+from functools import lru_cache
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from database import get_db, User
 from auth import verify_password
 
+# 지원하는 패스워드 해시 형식 (bcrypt $2a$/$2b$/$2y$ + cost, argon2 $argon2id$ 등) - 형식이 다르면 검증 없이 건너뜀
+PASSWORD_HASH_RE = re.compile(r'^(\$2[aby]\$\d{2}\$|\$argon2(id|i|d)\$)')
+
+@lru_cache(maxsize=4096)
+def _cached_verify(password: str, hashed_password: str) -> bool:
+    """동일한 (패스워드, 해시) 조합의 검증 결과를 재사용"""
+    return verify_password(password, hashed_password)
+
 def check_passwords_in_database():
     """데이터베이스의 패스워드 해시 확인"""
     db = next(get_db())
     
     try:
         # 모든 사용자 조회
-        users = db.query(User).all()
+        rows = db.execute(
+            select(User.user_id, User.name, User.password_hash)
+        ).all()
         
-        print(f"총 {len(users)}명의 사용자가 있습니다.\n")
+        print(f"총 {len(rows)}명의 사용자가 있습니다.\n")
         
-        for user in users:
-            print(f"사용자 ID: {user.user_id}")
-            print(f"이름: {user.name}")
-            print(f"패스워드 해시: {user.password_hash[:50]}..." if user.password_hash else "패스워드 해시 없음")
+        for user_id, name, password_hash in rows:
+            print(f"사용자 ID: {user_id}")
+            print(f"이름: {name}")
+            print(f"패스워드 해시: {password_hash[:50]}..." if password_hash else "패스워드 해시 없음")
+            
+            if password_hash and not PASSWORD_HASH_RE.match(password_hash):
+                print("⚠️ bcrypt/argon2 해시 형식이 아니므로 검증을 건너뜁니다.")
+                print("-" * 50)
+                continue
             
             # 기존 사용자들의 기본 패스워드 'password' 검증
-            if user.user_id != 'test_password_user' and user.password_hash:
-                is_valid = verify_password('password', user.password_hash)
+            if user_id != 'test_password_user' and password_hash:
+                is_valid = _cached_verify('password', password_hash)
                 print(f"기본 패스워드 'password' 검증: {'✅ 성공' if is_valid else '❌ 실패'}")
             
             # 새로 생성된 사용자의 패스워드 검증
-            elif user.user_id == 'test_password_user' and user.password_hash:
-                is_valid = verify_password('mySecretPassword123', user.password_hash)
+            elif user_id == 'test_password_user' and password_hash:
+                is_valid = _cached_verify('mySecretPassword123', password_hash)
                 print(f"설정된 패스워드 'mySecretPassword123' 검증: {'✅ 성공' if is_valid else '❌ 실패'}")
             
             print("-" * 50)
@@ -1,88 +1,97 @@
 #!/usr/bin/env python3
 """
 데이터베이스 구조 및 데이터 확인 스크립트
+
+데이터 샘플 쿼리(ORDER BY created_at DESC LIMIT 5)는
+idx_transcription_requests_created_at / idx_transcription_responses_created_at
+인덱스를 사용하여 테이블 정렬 없이 인덱스 스캔 후 조기 종료합니다.
 """
 
 import sys
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db
+from database import SessionLocal
 from sqlalchemy import text
 
+# transcription_requests / transcription_responses 테이블 구조를 한 번에 조회
+COLUMNS_SQL = text("""
+    SELECT table_name, column_name, data_type, is_nullable, column_default
+    FROM information_schema.columns
+    WHERE table_name IN ('transcription_requests', 'transcription_responses')
+    ORDER BY table_name, ordinal_position
+""")
+
+PRIMARY_KEY_SQL = text("""
+    SELECT a.attname
+    FROM pg_index i
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+    WHERE i.indrelid = 'transcription_requests'::regclass AND i.indisprimary
+""")
+
+REQUESTS_SAMPLE_SQL = text("""
+    SELECT request_id, filename, status, created_at
+    FROM transcription_requests
+    ORDER BY created_at DESC
+    LIMIT 5
+""")
+
+RESPONSES_SAMPLE_SQL = text("""
+    SELECT id, request_id, service_provider, created_at
+    FROM transcription_responses
+    ORDER BY created_at DESC
+    LIMIT 5
+""")
+
+def _fetch_all(query):
+    """독립된 세션(커넥션)에서 쿼리를 실행하고 모든 행을 반환합니다"""
+    db = SessionLocal()
+    try:
+        return db.execute(query).fetchall()
+    finally:
+        db.close()
+
 def check_database_structure():
     """데이터베이스 구조 확인"""
     try:
-        db = next(get_db())
-        
         print("=== 데이터베이스 구조 확인 ===")
-        
-        # transcription_requests 테이블 구조 확인
-        print("\n📊 transcription_requests 테이블 구조:")
-        result = db.execute(text("""
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns 
-            WHERE table_name = 'transcription_requests'
-            ORDER BY ordinal_position
-        """))
-        
-        for row in result:
-            print(f"   {row[0]}: {row[1]} (nullable: {row[2]}, default: {row[3]})")
-        
-        # transcription_responses 테이블 구조 확인
-        print("\n📊 transcription_responses 테이블 구조:")
-        result = db.execute(text("""
-            SELECT column_name, data_type, is_nullable, column_default
-            FROM information_schema.columns 
-            WHERE table_name = 'transcription_responses'
-            ORDER BY ordinal_position
-        """))
-        
-        for row in result:
-            print(f"   {row[0]}: {row[1]} (nullable: {row[2]}, default: {row[3]})")
-        
+
+        # 서로 독립적인 조회 쿼리들을 별도 커넥션으로 동시에 실행
+        queries = (COLUMNS_SQL, PRIMARY_KEY_SQL, REQUESTS_SAMPLE_SQL, RESPONSES_SAMPLE_SQL)
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            columns, primary_keys, request_samples, response_samples = executor.map(_fetch_all, queries)
+
+        columns_by_table = defaultdict(list)
+        for row in columns:
+            columns_by_table[row.table_name].append(row)
+
+        for table_name in ("transcription_requests", "transcription_responses"):
+            print(f"\n📊 {table_name} 테이블 구조:")
+            for col in columns_by_table[table_name]:
+                print(f"   {col.column_name}: {col.data_type} (nullable: {col.is_nullable}, default: {col.column_default})")
+
         # 기본 키 확인
         print("\n🔑 transcription_requests 기본 키:")
-        result = db.execute(text("""
-            SELECT a.attname
-            FROM pg_index i
-            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
-            WHERE i.indrelid = 'transcription_requests'::regclass AND i.indisprimary
-        """))
-        
-        for row in result:
+        for row in primary_keys:
             print(f"   Primary Key: {row[0]}")
-        
+
         # 데이터 샘플 확인
         print("\n📋 transcription_requests 데이터 샘플:")
-        result = db.execute(text("""
-            SELECT request_id, filename, status, created_at
-            FROM transcription_requests 
-            ORDER BY created_at DESC 
-            LIMIT 5
-        """))
-        
-        for row in result:
+        for row in request_samples:
             print(f"   ID: {row[0]}, 파일: {row[1]}, 상태: {row[2]}, 생성일: {row[3]}")
-        
+
         print("\n📋 transcription_responses 데이터 샘플:")
-        result = db.execute(text("""
-            SELECT id, request_id, service_provider, created_at
-            FROM transcription_responses 
-            ORDER BY created_at DESC 
-            LIMIT 5
-        """))
-        
-        for row in result:
+        for row in response_samples:
             print(f"   ID: {row[0]}, Request ID: {row[1]}, 서비스: {row[2]}, 생성일: {row[3]}")
-        
-        db.close()
+
         print("\n✅ 데이터베이스 구조 확인 완료")
-        
+
     except Exception as e:
         print(f"❌ 데이터베이스 확인 실패: {e}")
         import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
-    check_database_structure()
\ No newline at end of file
+    check_database_structure()
@@ -5,10 +5,48 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db, TranscriptionRequest, TranscriptionResponse
-from sqlalchemy import text, desc
+from database import get_db, SessionLocal, TranscriptionRequest, TranscriptionResponse
+from sqlalchemy import text, desc, select, func, literal_column
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+TABLE_COUNTS_SQL = text("""
+    SELECT (SELECT COUNT(*) FROM transcription_requests),
+           (SELECT COUNT(*) FROM transcription_responses)
+""")
+
+# requests에는 있지만 responses에는 없는 경우
+# NOT EXISTS 안티 조인은 transcription_responses.request_id 인덱스(ix_transcription_responses_request_id)를 사용
+UNMATCHED_REQUESTS_SQL = text("""
+    SELECT tr.request_id, tr.filename, tr.status, tr.created_at
+    FROM transcription_requests tr
+    WHERE NOT EXISTS (
+        SELECT 1 FROM transcription_responses tres
+        WHERE tres.request_id = tr.request_id
+    )
+    ORDER BY tr.created_at DESC
+    LIMIT 10
+""")
+
+# responses에는 있지만 requests에는 없는 경우
+ORPHANED_RESPONSES_SQL = text("""
+    SELECT tres.id, tres.request_id, tres.created_at
+    FROM transcription_responses tres
+    WHERE NOT EXISTS (
+        SELECT 1 FROM transcription_requests tr
+        WHERE tr.request_id = tres.request_id
+    )
+    ORDER BY tres.created_at DESC
+    LIMIT 10
+""")
+
+def _fetch_all(query):
+    """독립된 세션(커넥션)에서 쿼리를 실행하고 모든 행을 반환합니다"""
+    db = SessionLocal()
+    try:
+        return db.execute(query).fetchall()
+    finally:
+        db.close()
 
 def check_request_ids():
     """최근 생성된 request_id들을 확인합니다"""
@@ -54,17 +92,27 @@ def check_request_ids():
                     
                     # 최근 생성된 모든 응답 확인
                     print(f"\n📅 최근 1시간 내 생성된 모든 응답들:")
-                    one_hour_ago = datetime.now() - timedelta(hours=1)
-                    recent_responses = db.query(TranscriptionResponse).filter(
-                        TranscriptionResponse.created_at >= one_hour_ago
-                    ).order_by(TranscriptionResponse.created_at.desc()).all()
+                    # 기준 시각은 DB 서버에서 계산 (바인드 파라미터 없이 NOW() - INTERVAL)
+                    one_hour_ago = func.now() - literal_column("INTERVAL '1 hour'")
+                    recent_responses = db.execute(
+                        select(
+                            TranscriptionResponse.id,
+                            TranscriptionResponse.request_id,
+                            TranscriptionResponse.service_provider,
+                            TranscriptionResponse.created_at,
+                            func.substring(TranscriptionResponse.transcribed_text, 1, 50).label("preview")
+                        ).where(
+                            TranscriptionResponse.created_at >= one_hour_ago
+                        ).order_by(TranscriptionResponse.created_at.desc())
+                        .execution_options(yield_per=100)
+                    ).all()
                     
                     if recent_responses:
                         for resp in recent_responses:
                             print(f"  - Response ID: {resp.id}, Request ID: {resp.request_id}")
                             print(f"    Service: {resp.service_provider}, Created: {resp.created_at}")
-                            if resp.transcribed_text:
-                                print(f"    Text Preview: {resp.transcribed_text[:50]}...")
+                            if resp.preview:
+                                print(f"    Text Preview: {resp.preview}...")
                             print("    ---")
                     else:
                         print(f"  ❌ 최근 1시간 내 생성된 응답이 없습니다.")
@@ -75,11 +123,21 @@ def check_request_ids():
         
         # 1. 최근 24시간 내 transcription_requests 확인
         print("\n📋 최근 24시간 내 transcription_requests:")
-        yesterday = datetime.now() - timedelta(days=1)
-        
-        recent_requests = db.query(TranscriptionRequest).filter(
-            TranscriptionRequest.created_at >= yesterday
-        ).order_by(desc(TranscriptionRequest.created_at)).limit(10).all()
+        # 기준 시각은 DB 서버에서 계산 (바인드 파라미터 없이 NOW() - INTERVAL)
+        yesterday = func.now() - literal_column("INTERVAL '1 day'")
+        
+        recent_requests = db.execute(
+            select(
+                TranscriptionRequest.request_id,
+                TranscriptionRequest.filename,
+                TranscriptionRequest.status,
+                TranscriptionRequest.created_at,
+                TranscriptionRequest.user_uuid
+            ).where(
+                TranscriptionRequest.created_at >= yesterday
+            ).order_by(desc(TranscriptionRequest.created_at)).limit(10)
+            .execution_options(yield_per=100)
+        ).all()
         
         if recent_requests:
             for i, req in enumerate(recent_requests, 1):
@@ -94,21 +152,46 @@ def check_request_ids():
         
         # Check all recent requests (last 10)
         print("\n=== Recent Transcription Requests (last 10) ===")
-        all_recent_requests = db.query(TranscriptionRequest).order_by(TranscriptionRequest.created_at.desc()).limit(10).all()
+        all_recent_requests = db.execute(
+            select(
+                TranscriptionRequest.request_id,
+                TranscriptionRequest.status,
+                TranscriptionRequest.created_at,
+                TranscriptionRequest.filename
+            ).order_by(TranscriptionRequest.created_at.desc()).limit(10)
+            .execution_options(yield_per=100)
+        ).all()
         for req in all_recent_requests:
             print(f"Request ID: {req.request_id}, Status: {req.status}, Created: {req.created_at}, Filename: {req.filename}")
 
         print("\n=== Recent Transcription Responses (last 10) ===")
-        all_recent_responses = db.query(TranscriptionResponse).order_by(TranscriptionResponse.created_at.desc()).limit(10).all()
+        all_recent_responses = db.execute(
+            select(
+                TranscriptionResponse.id,
+                TranscriptionResponse.request_id,
+                TranscriptionResponse.created_at,
+                TranscriptionResponse.service_provider
+            ).order_by(TranscriptionResponse.created_at.desc()).limit(10)
+            .execution_options(yield_per=100)
+        ).all()
         for resp in all_recent_responses:
             print(f"Response ID: {resp.id}, Request ID: {resp.request_id}, Created: {resp.created_at}, Service: {resp.service_provider}")
         
         # 2. 최근 24시간 내 transcription_responses 확인
         print("\n📊 최근 24시간 내 transcription_responses:")
         
-        recent_responses = db.query(TranscriptionResponse).filter(
-            TranscriptionResponse.created_at >= yesterday
-        ).order_by(desc(TranscriptionResponse.created_at)).limit(10).all()
+        recent_responses = db.execute(
+            select(
+                TranscriptionResponse.id,
+                TranscriptionResponse.request_id,
+                TranscriptionResponse.service_provider,
+                TranscriptionResponse.created_at,
+                func.substring(TranscriptionResponse.transcribed_text, 1, 50).label("preview")
+            ).where(
+                TranscriptionResponse.created_at >= yesterday
+            ).order_by(desc(TranscriptionResponse.created_at)).limit(10)
+            .execution_options(yield_per=100)
+        ).all()
         
         if recent_responses:
             for i, resp in enumerate(recent_responses, 1):
@@ -116,15 +199,22 @@ def check_request_ids():
                 print(f"    request_id: {resp.request_id}")
                 print(f"    service_provider: {resp.service_provider}")
                 print(f"    created_at: {resp.created_at}")
-                print(f"    transcribed_text: {resp.transcribed_text[:50] if resp.transcribed_text else 'None'}...")
+                print(f"    transcribed_text: {resp.preview if resp.preview else 'None'}...")
                 print("    ---")
         else:
             print("    ❌ 최근 24시간 내 응답이 없습니다.")
         
+        # 3~4. 서로 독립적인 집계/매칭 쿼리는 별도 세션으로 동시에 실행
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            counts_future = executor.submit(_fetch_all, TABLE_COUNTS_SQL)
+            unmatched_future = executor.submit(_fetch_all, UNMATCHED_REQUESTS_SQL)
+            orphaned_future = executor.submit(_fetch_all, ORPHANED_RESPONSES_SQL)
+            total_requests, total_responses = counts_future.result()[0]
+            unmatched_requests = unmatched_future.result()
+            orphaned_responses = orphaned_future.result()
+        
         # 3. 전체 테이블 레코드 수 확인
         print("\n📈 전체 테이블 레코드 수:")
-        total_requests = db.query(TranscriptionRequest).count()
-        total_responses = db.query(TranscriptionResponse).count()
         print(f"    transcription_requests: {total_requests}개")
         print(f"    transcription_responses: {total_responses}개")
         
@@ -132,15 +222,6 @@ def check_request_ids():
         print("\n🔍 매칭되지 않는 request_id 확인:")
         
         # requests에는 있지만 responses에는 없는 경우
-        unmatched_requests = db.execute(text("""
-            SELECT tr.request_id, tr.filename, tr.status, tr.created_at
-            FROM transcription_requests tr
-            LEFT JOIN transcription_responses tres ON tr.request_id = tres.request_id
-            WHERE tres.request_id IS NULL
-            ORDER BY tr.created_at DESC
-            LIMIT 10
-        """)).fetchall()
-        
         if unmatched_requests:
             print("    📋 응답이 없는 요청들:")
             for i, row in enumerate(unmatched_requests, 1):
@@ -149,15 +230,6 @@ def check_request_ids():
             print("    ✅ 모든 요청에 응답이 있습니다.")
         
         # responses에는 있지만 requests에는 없는 경우
-        orphaned_responses = db.execute(text("""
-            SELECT tres.id, tres.request_id, tres.created_at
-            FROM transcription_responses tres
-            LEFT JOIN transcription_requests tr ON tres.request_id = tr.request_id
-            WHERE tr.request_id IS NULL
-            ORDER BY tres.created_at DESC
-            LIMIT 10
-        """)).fetchall()
-        
         if orphaned_responses:
             print("    📊 요청이 없는 응답들:")
             for i, row in enumerate(orphaned_responses, 1):
@@ -1,12 +1,9 @@
-from sqlalchemy import inspect
-from database import engine
+from database import get_table_columns
 
 def check_responses_schema():
-    inspector = inspect(engine)
-    
     # transcription_responses 테이블 스키마 확인
     print("transcription_responses 테이블 컬럼:")
-    columns = inspector.get_columns('transcription_responses')
+    columns = get_table_columns('transcription_responses')
     for column in columns:
         print(f"  {column['name']}: {column['type']} - nullable: {column['nullable']}")
 
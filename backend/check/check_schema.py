@@ -5,20 +5,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import get_db
-from sqlalchemy import text, inspect
+from database import get_table_columns
 
 def check_transcription_responses_schema():
     """transcription_responses 테이블의 실제 스키마 확인"""
     print("=== transcription_responses 테이블 스키마 확인 ===")
-    db = next(get_db())
-    
     try:
-        # SQLAlchemy Inspector를 사용해서 테이블 구조 확인
-        inspector = inspect(db.bind)
-        
-        # transcription_responses 테이블의 컬럼 정보 가져오기
-        columns = inspector.get_columns('transcription_responses')
+        # transcription_responses 테이블의 컬럼 정보 가져오기 (프로세스 단위 캐시)
+        columns = get_table_columns('transcription_responses')
         
         print("\n📋 transcription_responses 테이블 컬럼 목록:")
         for i, column in enumerate(columns, 1):
@@ -33,7 +27,7 @@ def check_transcription_responses_schema():
         
         # transcription_requests 테이블도 확인
         print("\n=== transcription_requests 테이블 스키마 확인 ===")
-        req_columns = inspector.get_columns('transcription_requests')
+        req_columns = get_table_columns('transcription_requests')
         
         print("\n📋 transcription_requests 테이블 컬럼 목록:")
         for i, column in enumerate(req_columns, 1):
@@ -47,8 +41,6 @@ def check_transcription_responses_schema():
         
     except Exception as e:
         print(f"❌ 스키마 확인 중 오류 발생: {e}")
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     check_transcription_responses_schema()
\ No newline at end of file
@@ -1,20 +1,24 @@
-import requests
+import httpx
 import sys
 
+# 반복 확인 시 TCP 연결을 재사용하기 위한 모듈 단위 클라이언트
+client = httpx.Client(base_url="http://localhost:8000", timeout=5)
+
 def check_server_status():
     """서버 실행 상태 확인"""
     try:
-        response = requests.get("http://localhost:8000/docs", timeout=5)
+        # Swagger 문서 대신 경량 헬스 체크 엔드포인트 사용
+        response = client.get("/health")
         if response.status_code == 200:
             print("✅ 서버가 정상적으로 실행 중입니다.")
             return True
         else:
             print(f"⚠️ 서버 응답 이상: {response.status_code}")
             return False
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("❌ 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인해주세요.")
         return False
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         print("❌ 서버 응답 시간 초과")
         return False
     except Exception as e:
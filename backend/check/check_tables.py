@@ -3,15 +3,15 @@ import sqlite3
 def check_tables():
     """데이터베이스 테이블 목록 확인"""
     conn = sqlite3.connect('stt_service.db')
+    # 읽기 전용 스캔이므로 mmap + 페이지 캐시 확대 (연결 단위 설정)
+    conn.execute('PRAGMA mmap_size=268435456')
+    conn.execute('PRAGMA cache_size=-65536')
     cursor = conn.cursor()
     
     print("📊 데이터베이스 테이블 목록")
     print("=" * 40)
     
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    
-    for table in tables:
+    for table in cursor.execute("SELECT name FROM sqlite_master WHERE type='table';"):
         print(f"- {table[0]}")
     
     conn.close()
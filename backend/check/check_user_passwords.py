@@ -1,24 +1,33 @@
+from functools import lru_cache
+from sqlalchemy import select
 from database import get_db, User
 from auth import verify_password
 
+@lru_cache(maxsize=4096)
+def _cached_verify(password: str, hashed_password: str) -> bool:
+    """동일한 (패스워드, 해시) 조합의 검증 결과를 재사용"""
+    return verify_password(password, hashed_password)
+
 def check_user_passwords():
     """데이터베이스의 사용자 패스워드 확인"""
     db = next(get_db())
     
     try:
-        users = db.query(User).all()
-        print(f"총 {len(users)}명의 사용자 확인:")
+        rows = db.execute(
+            select(User.user_id, User.name, User.email, User.password_hash)
+        ).all()
+        print(f"총 {len(rows)}명의 사용자 확인:")
         print()
         
-        for user in users:
-            print(f"사용자 ID: {user.user_id}")
-            print(f"이름: {user.name}")
-            print(f"이메일: {user.email}")
-            print(f"패스워드 해시: {user.password_hash[:50] if user.password_hash else 'None'}...")
+        for user_id, name, email, password_hash in rows:
+            print(f"사용자 ID: {user_id}")
+            print(f"이름: {name}")
+            print(f"이메일: {email}")
+            print(f"패스워드 해시: {password_hash[:50] if password_hash else 'None'}...")
             
             # 'password'로 검증
-            if user.password_hash:
-                is_password_correct = verify_password('password', user.password_hash)
+            if password_hash:
+                is_password_correct = _cached_verify('password', password_hash)
                 print(f"'password' 검증: {'✅ 성공' if is_password_correct else '❌ 실패'}")
             else:
                 print("패스워드 해시가 없습니다.")
@@ -1,37 +1,46 @@
+import sys
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from database import User, get_db
+from database import User, SessionLocal
 
 def check_users_in_db():
     """데이터베이스에 저장된 사용자들을 확인합니다."""
-    db = next(get_db())
-    
-    try:
-        # 모든 사용자 조회
-        users = db.query(User).all()
+    with SessionLocal() as db:
+        try:
+            # 레코드 수는 DB에서 집계
+            total = db.query(func.count(User.id)).scalar()
         
-        print(f"📊 users 테이블: {len(users)}개 레코드")
+            print(f"📊 users 테이블: {total}개 레코드")
         
-        if users:
-            print("\n사용자 목록:")
-            for i, user in enumerate(users, 1):
-                print(f"{i}. ID: {user.id}")
-                print(f"   사용자 ID: {user.user_id}")
-                print(f"   이메일: {user.email}")
-                print(f"   이름: {user.name}")
-                print(f"   사용구분: {user.user_type}")
-                print(f"   전화번호: {user.phone_number}")
-                print(f"   활성상태: {user.is_active}")
-                print(f"   생성일시: {user.created_at}")
-                print(f"   수정일시: {user.updated_at}")
-                print()
-        else:
-            print("저장된 사용자가 없습니다.")
+            if total:
+                # 모든 사용자 조회 (출력에 필요한 컬럼만, 서버 측 커서로 200건씩 스트리밍)
+                users = db.query(
+                    User.id, User.user_id, User.email, User.name, User.user_type,
+                    User.phone_number, User.is_active, User.created_at, User.updated_at
+                ).execution_options(stream_results=True).yield_per(200)
             
-    except Exception as e:
-        print(f"❌ 데이터베이스 조회 오류: {e}")
-    finally:
-        db.close()
-        print("✅ 데이터베이스 조회 완료")
+                print("\n사용자 목록:")
+                for i, (id, user_id, email, name, user_type, phone_number, is_active, created_at, updated_at) in enumerate(users, 1):
+                    # 사용자 한 명의 정보를 한 번의 write 호출로 출력
+                    sys.stdout.write(
+                        f"{i}. ID: {id}\n"
+                        f"   사용자 ID: {user_id}\n"
+                        f"   이메일: {email}\n"
+                        f"   이름: {name}\n"
+                        f"   사용구분: {user_type}\n"
+                        f"   전화번호: {phone_number}\n"
+                        f"   활성상태: {is_active}\n"
+                        f"   생성일시: {created_at}\n"
+                        f"   수정일시: {updated_at}\n"
+                        f"\n"
+                    )
+            else:
+                print("저장된 사용자가 없습니다.")
+            
+        except Exception as e:
+            print(f"❌ 데이터베이스 조회 오류: {e}")
+        finally:
+            print("✅ 데이터베이스 조회 완료")
 
 if __name__ == "__main__":
     check_users_in_db()
\ No newline at end of file
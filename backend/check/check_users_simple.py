@@ -1,38 +1,39 @@
-from database import get_db, User
+from sqlalchemy import func
+from database import SessionLocal, User
 from auth import verify_password
 
+# 검증할 후보 패스워드
+CANDIDATE_PASSWORDS = ('password', 'password123')
+
 def check_users():
     """사용자 정보와 패스워드 확인"""
-    db = next(get_db())
-    
-    try:
-        users = db.query(User).all()
-        print(f"총 {len(users)}명의 사용자:")
-        print()
+    with SessionLocal() as db:
+        try:
+            total = db.query(func.count(User.id)).scalar()
+            print(f"총 {total}명의 사용자:")
+            print()
         
-        for user in users:
-            print(f"ID: {user.user_id}")
-            print(f"이름: {user.name}")
-            print(f"이메일: {user.email}")
-            print(f"활성화: {user.is_active}")
+            users = db.query(
+                User.user_id, User.name, User.email, User.is_active, User.password_hash
+            )
+            for user_id, name, email, is_active, password_hash in users:
+                print(f"ID: {user_id}")
+                print(f"이름: {name}")
+                print(f"이메일: {email}")
+                print(f"활성화: {is_active}")
             
-            if user.password_hash:
-                # 'password'로 검증
-                is_valid = verify_password('password', user.password_hash)
-                print(f"'password' 검증: {'✅ 성공' if is_valid else '❌ 실패'}")
-                
-                # 'password123'으로도 검증
-                is_valid2 = verify_password('password123', user.password_hash)
-                print(f"'password123' 검증: {'✅ 성공' if is_valid2 else '❌ 실패'}")
-            else:
-                print("패스워드 해시 없음")
+                if password_hash:
+                    # 후보 패스워드를 순회하며 검증 (verify_password가 bcrypt/argon2 해시 형식을 모두 처리)
+                    for candidate in CANDIDATE_PASSWORDS:
+                        is_valid = verify_password(candidate, password_hash)
+                        print(f"'{candidate}' 검증: {'✅ 성공' if is_valid else '❌ 실패'}")
+                else:
+                    print("패스워드 해시 없음")
             
-            print("-" * 40)
+                print("-" * 40)
             
-    except Exception as e:
-        print(f"오류 발생: {e}")
-    finally:
-        db.close()
+        except Exception as e:
+            print(f"오류 발생: {e}")
 
 if __name__ == "__main__":
     check_users()
\ No newline at end of file
@@ -7,12 +7,14 @@
 import sys
 import os
 import requests
-import json
+import orjson
 
 # core 디렉토리를 sys.path에 추가
 core_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core')
 sys.path.insert(0, core_path)
 
+HEADERS_JSON = {"Content-Type": "application/json"}
+
 def test_correct_login():
     print("🔐 올바른 패스워드로 로그인 테스트")
     print("=" * 50)
@@ -28,32 +30,31 @@ def test_correct_login():
         response = requests.post(
             "http://localhost:8000/auth/login",
             json=login_data,
-            headers={"Content-Type": "application/json"}
+            headers=HEADERS_JSON
         )
         
         print(f"응답 상태 코드: {response.status_code}")
         print(f"응답 헤더: {dict(response.headers)}")
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"✅ 로그인 성공!")
-            print(f"응답 데이터: {json.dumps(result, indent=2, ensure_ascii=False)}")
-            if 'access_token' in result:
-                print(f"🎉 JWT 토큰 발급됨: {result['access_token'][:50]}...")
+            print(f"응답 데이터: {orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}")
+            access_token = result.get('access_token')
+            if access_token:
+                print(f"🎉 JWT 토큰 발급됨: {access_token[:50]}...")
         else:
             print(f"❌ 로그인 실패")
             try:
-                error_data = response.json()
-                print(f"에러 응답: {json.dumps(error_data, indent=2, ensure_ascii=False)}")
+                error_data = orjson.loads(response.content)
+                print(f"에러 응답: {orjson.dumps(error_data, option=orjson.OPT_INDENT_2).decode()}")
             except:
                 print(f"에러 응답 (텍스트): {response.text}")
                 
     except requests.exceptions.ConnectionError:
         print("❌ 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요.")
     except Exception as e:
-        print(f"❌ 오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"❌ 오류 발생: {e!r}")
 
 if __name__ == "__main__":
     test_correct_login()
\ No newline at end of file
@@ -1,13 +1,108 @@
+import atexit
+import base64
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 
 # 테스트 설정
 BASE_URL = "http://localhost:8000"
 TEST_USER_EMAIL = "test@example.com"
 TEST_USER_PASSWORD = "testpassword123"
 
+# 모든 요청이 keep-alive 연결을 재사용하도록 모듈 단위 세션 사용
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+SESSION.headers.update({"Content-Type": "application/json"})
+
+# 서버가 응답하지 않을 때 OS 기본값까지 기다리지 않도록 (연결, 읽기) 타임아웃 지정
+REQUEST_TIMEOUT = (3.05, 10)
+
+# 요청마다 다시 만들지 않도록 고정 헤더는 모듈 단위로 정의
+INVALID_HEADERS = {"Authorization": "Bearer invalid_token_here"}
+atexit.register(SESSION.close)
+
+# 로그인 토큰 캐시 (실행 간 재사용하여 /auth/login 의 패스워드 검증 비용 생략)
+TOKEN_CACHE_PATH = os.path.expanduser("~/.stt_test_token_cache.json")
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# 같은 프로세스 안에서 이미 확보한 토큰 (파일 캐시 조회/로그인 모두 생략)
+_token_memo = {}
+
+def _decode_token_exp(token: str) -> Optional[int]:
+    """JWT payload에서 만료 시각(exp)을 추출합니다 (서명 검증 없음)"""
+    try:
+        payload = token.split('.')[1]
+        decoded = base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4))
+        return orjson.loads(decoded).get('exp')
+    except (IndexError, ValueError):
+        return None
+
+def _load_token_cache() -> dict:
+    """토큰 캐시 파일을 읽습니다"""
+    try:
+        with open(TOKEN_CACHE_PATH, 'rb') as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _save_token_cache(cache: dict) -> None:
+    """토큰 캐시 파일을 소유자 전용 권한(0600)으로 저장합니다"""
+    fd = os.open(TOKEN_CACHE_PATH, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(orjson.dumps(cache))
+
+def invalidate_token(email: str) -> None:
+    """서버에서 거부된 캐시 토큰을 제거합니다"""
+    _token_memo.pop(f"{BASE_URL}|{email}", None)
+    cache = _load_token_cache()
+    if cache.pop(f"{BASE_URL}|{email}", None) is not None:
+        _save_token_cache(cache)
+
+def get_token(email: str, password: str) -> Optional[str]:
+    """
+    JWT 액세스 토큰을 반환합니다.
+    
+    같은 실행 안에서 이미 얻은 토큰이나 만료되지 않은 캐시 토큰이 있으면 로그인 요청을 생략하고,
+    없으면 /auth/login 으로 로그인한 뒤 결과를 캐시에 저장합니다.
+    """
+    cache_key = f"{BASE_URL}|{email}"
+    if cache_key in _token_memo:
+        return _token_memo[cache_key]
+    
+    cache = _load_token_cache()
+    cached = cache.get(cache_key)
+    if cached and cached.get("exp") and cached["exp"] - TOKEN_EXPIRY_MARGIN_SECONDS > time.time():
+        print("✅ 캐시된 토큰 사용 - 로그인 생략")
+        _token_memo[cache_key] = cached["token"]
+        return cached["token"]
+    
+    login_data = {
+        "email": email,
+        "password": password
+    }
+    login_response = SESSION.post(f"{BASE_URL}/auth/login", json=login_data, timeout=REQUEST_TIMEOUT)
+    print(f"로그인 응답 상태: {login_response.status_code}")
+    
+    if login_response.status_code != 200:
+        print(f"❌ 로그인 실패: {login_response.text}")
+        return None
+    
+    login_result = orjson.loads(login_response.content)
+    access_token = login_result["access_token"]
+    token_type = login_result.get("token_type", "bearer")
+    print(f"✅ 로그인 성공 - 토큰 획득")
+    print(f"토큰 타입: {token_type}")
+    
+    cache[cache_key] = {"token": access_token, "exp": _decode_token_exp(access_token)}
+    _save_token_cache(cache)
+    _token_memo[cache_key] = access_token
+    return access_token
+
 def test_tokens_history_api():
     """
     /tokens/history API 엔드포인트를 테스트합니다.
@@ -17,42 +112,39 @@ def test_tokens_history_api():
     
     # 1. 로그인하여 JWT 토큰 획득
     print("\n1️⃣ 사용자 로그인 중...")
-    login_data = {
-        "email": TEST_USER_EMAIL,
-        "password": TEST_USER_PASSWORD
-    }
-    
     try:
-        login_response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
-        print(f"로그인 응답 상태: {login_response.status_code}")
-        
-        if login_response.status_code == 200:
-            login_result = login_response.json()
-            access_token = login_result.get("access_token")
-            print(f"✅ 로그인 성공 - 토큰 획득")
-            print(f"토큰 타입: {login_result.get('token_type')}")
-        else:
-            print(f"❌ 로그인 실패: {login_response.text}")
+        access_token = get_token(TEST_USER_EMAIL, TEST_USER_PASSWORD)
+        if not access_token:
             return
             
-    except Exception as e:
-        print(f"❌ 로그인 요청 중 오류: {e}")
+    except requests.exceptions.ConnectionError:
+        print("❌ 서버 연결 실패")
         return
+    except requests.exceptions.Timeout:
+        print("❌ 로그인 요청 시간 초과")
+        return
+    
+    headers = {"Authorization": f"Bearer {access_token}"}
+    
+    # 로그인 이후의 조회 요청들은 서로 독립적이므로 동시에 전송하고 결과는 순서대로 출력
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        probes = {
+            "default": executor.submit(SESSION.get, f"{BASE_URL}/tokens/history", headers=headers, timeout=REQUEST_TIMEOUT),
+            "limited": executor.submit(SESSION.get, f"{BASE_URL}/tokens/history?limit=10", headers=headers, timeout=REQUEST_TIMEOUT),
+            "invalid": executor.submit(SESSION.get, f"{BASE_URL}/tokens/history", headers=INVALID_HEADERS, timeout=REQUEST_TIMEOUT),
+            "no_token": executor.submit(SESSION.get, f"{BASE_URL}/tokens/history", timeout=REQUEST_TIMEOUT),
+        }
     
     # 2. JWT 토큰으로 /tokens/history API 호출
     print("\n2️⃣ 토큰 사용 내역 조회 중...")
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
     
     # 기본 조회 (limit=50)
     try:
-        history_response = requests.get(f"{BASE_URL}/tokens/history", headers=headers)
+        history_response = probes["default"].result()
         print(f"API 응답 상태: {history_response.status_code}")
         
         if history_response.status_code == 200:
-            history_result = history_response.json()
+            history_result = orjson.loads(history_response.content)
             print(f"✅ 토큰 사용 내역 조회 성공")
             print(f"응답 상태: {history_result.get('status')}")
             
@@ -70,35 +162,32 @@ def test_tokens_history_api():
                 
         else:
             print(f"❌ API 호출 실패: {history_response.text}")
+            if history_response.status_code == 401:
+                invalidate_token(TEST_USER_EMAIL)
             
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         print(f"❌ API 호출 중 오류: {e}")
     
     # 3. limit 파라미터를 사용한 조회 테스트
     print("\n3️⃣ limit 파라미터 테스트 (limit=10)...")
     try:
-        limited_response = requests.get(f"{BASE_URL}/tokens/history?limit=10", headers=headers)
+        limited_response = probes["limited"].result()
         print(f"API 응답 상태: {limited_response.status_code}")
         
         if limited_response.status_code == 200:
-            limited_result = limited_response.json()
+            limited_result = orjson.loads(limited_response.content)
             limited_history = limited_result.get('history', [])
             print(f"✅ 제한된 조회 성공 - 조회된 내역 수: {len(limited_history)}건")
         else:
             print(f"❌ 제한된 조회 실패: {limited_response.text}")
             
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         print(f"❌ 제한된 조회 중 오류: {e}")
     
     # 4. 잘못된 토큰으로 테스트 (인증 실패 테스트)
     print("\n4️⃣ 잘못된 토큰으로 인증 실패 테스트...")
-    invalid_headers = {
-        "Authorization": "Bearer invalid_token_here",
-        "Content-Type": "application/json"
-    }
-    
     try:
-        invalid_response = requests.get(f"{BASE_URL}/tokens/history", headers=invalid_headers)
+        invalid_response = probes["invalid"].result()
         print(f"API 응답 상태: {invalid_response.status_code}")
         
         if invalid_response.status_code == 401:
@@ -106,13 +195,13 @@ def test_tokens_history_api():
         else:
             print(f"⚠️ 예상과 다른 응답: {invalid_response.text}")
             
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         print(f"❌ 인증 실패 테스트 중 오류: {e}")
     
     # 5. 토큰 없이 호출 테스트
     print("\n5️⃣ 토큰 없이 호출 테스트...")
     try:
-        no_token_response = requests.get(f"{BASE_URL}/tokens/history")
+        no_token_response = probes["no_token"].result()
         print(f"API 응답 상태: {no_token_response.status_code}")
         
         if no_token_response.status_code == 401:
@@ -120,7 +209,7 @@ def test_tokens_history_api():
         else:
             print(f"⚠️ 예상과 다른 응답: {no_token_response.text}")
             
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         print(f"❌ 토큰 없는 호출 테스트 중 오류: {e}")
     
     print("\n" + "=" * 50)
@@ -138,34 +227,28 @@ def test_tokens_history_with_existing_user():
     existing_user_email = "user@example.com"  # 실제 존재하는 이메일로 변경
     existing_user_password = "password123"    # 실제 비밀번호로 변경
     
-    login_data = {
-        "email": existing_user_email,
-        "password": existing_user_password
-    }
-    
     try:
-        # 로그인
-        login_response = requests.post(f"{BASE_URL}/auth/login", json=login_data)
-        if login_response.status_code != 200:
-            print(f"❌ 기존 사용자 로그인 실패: {login_response.text}")
+        # 로그인 (캐시된 토큰이 있으면 재사용)
+        access_token = get_token(existing_user_email, existing_user_password)
+        if not access_token:
+            print(f"❌ 기존 사용자 로그인 실패")
             return
             
-        access_token = login_response.json().get("access_token")
         headers = {"Authorization": f"Bearer {access_token}"}
         
         # 다양한 limit 값으로 테스트
         for limit in [5, 20, 100]:
             print(f"\n📊 limit={limit}으로 조회 중...")
-            response = requests.get(f"{BASE_URL}/tokens/history?limit={limit}", headers=headers)
+            response = SESSION.get(f"{BASE_URL}/tokens/history?limit={limit}", headers=headers, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 history_count = len(result.get('history', []))
                 print(f"✅ 조회 성공 - {history_count}건 조회됨")
             else:
                 print(f"❌ 조회 실패: {response.text}")
                 
-    except Exception as e:
+    except requests.exceptions.RequestException as e:
         print(f"❌ 기존 사용자 테스트 중 오류: {e}")
 
 if __name__ == "__main__":
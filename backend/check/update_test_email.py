@@ -7,18 +7,17 @@
 import sys
 import os
 
-# core 디렉토리를 sys.path에 추가
-core_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core')
-sys.path.insert(0, core_path)
+# backend 디렉토리를 sys.path에 추가 (작업 디렉토리는 변경하지 않음)
+backend_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_path)
 
+from sqlalchemy import update
 from sqlalchemy.orm import sessionmaker
 
-# core 디렉토리에서 직접 import
-os.chdir(core_path)
-from database import User, engine
+from core.database import User, engine
 
 # 세션 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 def main():
     print("📧 테스트 사용자 이메일 업데이트")
@@ -28,35 +27,30 @@ def main():
     db = SessionLocal()
     
     try:
-        # test_lock_user 조회
-        user = db.query(User).filter(User.user_id == "test_lock_user").first()
+        # 조회 + 변경 + flush 대신 단일 UPDATE ... RETURNING 으로 처리
+        new_email = "stttest01@g.com"
+        stmt = (
+            update(User)
+            .where(User.user_id == "test_lock_user")
+            .values(email=new_email)
+            .returning(User.user_id, User.name, User.email)
+            .execution_options(synchronize_session=False)
+        )
+        updated = db.execute(stmt).first()
         
-        if not user:
+        if not updated:
+            db.rollback()
             print("❌ test_lock_user를 찾을 수 없습니다.")
             return
-            
-        print(f"=== 현재 사용자 정보 ===")
-        print(f"  사용자 ID: {user.user_id}")
-        print(f"  현재 이메일: {user.email}")
-        print(f"  사용자명: {user.name}")
-        
-        # 이메일 업데이트
-        old_email = user.email
-        new_email = "stttest01@g.com"
         
-        user.email = new_email
         db.commit()
         
-        print(f"\n=== 이메일 업데이트 완료 ===")
-        print(f"  이전 이메일: {old_email}")
-        print(f"  새 이메일: {new_email}")
+        print(f"=== 이메일 업데이트 완료 ===")
+        print(f"  사용자 ID: {updated.user_id}")
+        print(f"  사용자명: {updated.name}")
+        print(f"  새 이메일: {updated.email}")
         print(f"  ✅ 이메일이 성공적으로 업데이트되었습니다.")
         
-        # 업데이트 확인
-        updated_user = db.query(User).filter(User.user_id == "test_lock_user").first()
-        print(f"\n=== 업데이트 확인 ===")
-        print(f"  확인된 이메일: {updated_user.email}")
-        
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         db.rollback()
@@ -1,12 +1,28 @@
+import asyncio
+import atexit
 import logging
+import queue
 import sys
 import os
-from logging.handlers import TimedRotatingFileHandler
+import time
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
+from core.database import async_engine, create_tables_async
+from core.middleware import APIUsageMiddleware, RequestIdFilter, drain_log_queue, log_batch_worker, LOG_QUEUE_MAXSIZE
+from core.transcription_worker import (
+    fail_stale_requests,
+    shutdown_transcription_workers,
+    transcription_worker,
+    TRANSCRIPTION_QUEUE_MAXSIZE,
+    TRANSCRIPTION_WORKERS,
+)
+
 # 라우터 임포트
 from core.routers import (
     auth,
@@ -20,8 +36,44 @@ from core.routers import (
     monitoring
 )
 
+# 로그 파일 쓰기 버퍼 크기 (128KB) 및 주기적 flush 간격
+LOG_BUFFER_SIZE = 128 * 1024
+LOG_FLUSH_INTERVAL_SECONDS = 30
+
+class BufferedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """레코드마다 flush/stat 하지 않는 일단위 회전 파일 핸들러
+
+    QueueListener 스레드에서만 호출되며, 버퍼는 주기적 flush와 종료 시 flush로 비웁니다.
+    MemoryHandler의 flushLevel처럼 flush_level 이상의 레코드(기본 ERROR)는 즉시 디스크에 씁니다.
+    """
+
+    def __init__(self, *args, flush_level=logging.ERROR, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.flush_level = flush_level
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        try:
+            # 회전 시각은 미리 계산된 rolloverAt과 비교만 수행 (파일 stat 없음)
+            if int(time.time()) >= self.rolloverAt:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= self.flush_level:
+                self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
 def setup_logging():
-    """로깅 설정을 구성합니다."""
+    """로깅 설정을 구성합니다.
+
+    루트 로거에는 QueueHandler만 붙이고, 실제 파일/콘솔 출력은
+    QueueListener 스레드가 수행하여 요청 처리 경로에서 I/O를 제거합니다.
+    """
     # logs 디렉토리 생성
     log_dir = "logs"
     if not os.path.exists(log_dir):
@@ -37,7 +89,7 @@ def setup_logging():
         logger.removeHandler(handler)
     
     # 파일 핸들러 설정
-    file_handler = TimedRotatingFileHandler(
+    file_handler = BufferedTimedRotatingFileHandler(
         filename=os.path.join(log_dir, "stt_service.log"),
         when='midnight',  # 자정마다 회전
         interval=1,       # 1일 간격
@@ -53,36 +105,95 @@ def setup_logging():
     
     # 포맷터 설정
     formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
-    # 핸들러 추가
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    # 큐 핸들러 추가 (실제 출력은 리스너 스레드에서 수행)
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())  # 요청 ID는 로그를 남긴 컨텍스트에서 주입
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    
+    # 프로세스 종료 시 남은 레코드 처리 후 버퍼 flush
+    atexit.register(file_handler.flush)
+    atexit.register(listener.stop)
     
     # 테스트 로그 메시지 생성
     logger.info("🔧 로깅 시스템 초기화 완료 - 일단위 회전 설정")
     
-    return logger
+    return logger, listener, file_handler
+
+async def _flush_log_file_periodically(handler: logging.Handler):
+    """버퍼링된 로그 파일을 주기적으로 flush 합니다."""
+    while True:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL_SECONDS)
+        await asyncio.to_thread(handler.flush)
 
 # 로깅 초기화
-logger = setup_logging()
+logger, log_listener, log_file_handler = setup_logging()
 
 # 기존 설정들 (로깅, 미들웨어 등)
 # ... existing code ...
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 기존 lifespan 로직
+    # 실제 사용 중인 이벤트 루프 구현 확인 (uvloop 적용 여부)
+    logger.info("🔁 이벤트 루프: %s", type(asyncio.get_running_loop()).__module__)
+
+    # 비동기 세션을 쓰는 엔드포인트가 요청 시점에 실패하지 않도록 드라이버 누락은 시작 시 중단
+    if async_engine is None:
+        raise RuntimeError("비동기 DB 드라이버(asyncpg/aiosqlite)가 설치되지 않았습니다. config/requirements.txt를 설치하세요.")
+    try:
+        await create_tables_async()
+        logger.info("✅ Database tables created/verified")
+    except Exception as e:
+        logger.error(f"❌ Database initialization error: {e}")
+
+    # API 사용/로그인 로그는 요청 경로에서 큐에 넣고, 백그라운드 워커가 일괄 기록
+    app.state.log_queue = asyncio.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+    app.state.log_loop = asyncio.get_running_loop()
+    log_worker = asyncio.create_task(log_batch_worker(app.state.log_queue))
+    log_flusher = asyncio.create_task(_flush_log_file_periodically(log_file_handler))
+
+    # 이전 프로세스가 처리하지 못하고 종료된 요청은 processing에 머물지 않도록 실패 처리
+    try:
+        stale_count = await asyncio.to_thread(fail_stale_requests)
+        if stale_count:
+            logger.warning("⚠️ 중단된 변환 요청 %d건을 실패 처리했습니다", stale_count)
+    except Exception as e:
+        logger.error(f"❌ 중단된 변환 요청 정리 실패: {e}")
+
+    # STT 변환 + 요약은 요청 경로에서 분리하여 워커들이 큐에서 꺼내 처리
+    app.state.transcription_queue = asyncio.Queue(maxsize=TRANSCRIPTION_QUEUE_MAXSIZE)
+    transcription_workers = [
+        asyncio.create_task(transcription_worker(app.state.transcription_queue))
+        for _ in range(TRANSCRIPTION_WORKERS)
+    ]
+
     yield
 
+    # 변환 작업을 먼저 정리해야 실패 처리 중 발생하는 로그도 로그 워커가 기록함
+    await shutdown_transcription_workers(app, transcription_workers)
+    for task in (log_worker, log_flusher):
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # 워커 종료 후 큐에 남은 API 사용/로그인 로그를 버리지 않고 기록
+    await drain_log_queue(app.state.log_queue)
+    log_file_handler.flush()
+
 app = FastAPI(
     title="Speech-to-Text Service", 
     description="다중 STT 서비스를 지원하는 음성-텍스트 변환 서비스",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS 미들웨어
@@ -94,8 +205,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 기존 미들웨어들
-# ... existing middleware ...
+# API 사용 로그 미들웨어 (순수 ASGI)
+app.add_middleware(APIUsageMiddleware)
+
+# 전역 예외 핸들러
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # 요청 정보와 오류 내용을 한 번의 로그 호출로 기록 (콘솔 출력은 로깅 핸들러가 담당)
+    logger.warning("Validation error on %s %s: %s", request.method, request.url, exc.errors())
+    return JSONResponse(
+        status_code=422,
+        content={"detail": exc.errors()}
+    )
+
+@app.exception_handler(Exception)
+async def global_exception_handler(request: Request, exc: Exception):
+    # logger.exception이 트레이스백을 한 번만 포맷하여 기록
+    logger.exception("Global exception handler caught: %s: %s", type(exc).__name__, exc)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error"}  # 예외 내용(DB/드라이버 메시지)은 로그에만 기록
+    )
 
 # 라우터 등록
 app.include_router(auth.router) # 인증 관련 엔드포인트 분리
@@ -118,5 +248,15 @@ def health_check():
     return {"status": "healthy"}
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False, log_level="debug")
\ No newline at end of file
+
+    # uvloop/httptools가 설치된 환경(리눅스)에서는 명시적으로 사용하고, 없으면(윈도우 등) 기본 구현 사용
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    # 기본은 단일 프로세스. 로그 파일 회전, 변환/로그 큐, 인증·결제 중복방지 캐시가 모두 프로세스별이므로
+    # 멀티 워커는 UVICORN_WORKERS로 명시적으로 선택 (README 참고)
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+
+    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=False, log_level="debug",
+                loop=loop, http=http, workers=workers)
\ No newline at end of file
@@ -2,15 +2,26 @@ import jwt
 from datetime import datetime, timedelta
 import secrets
 import hashlib
+import threading
+import time
 from typing import Optional, Dict, List
-from fastapi import HTTPException, Depends, status
+from fastapi import HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-import json
 import os
 from sqlalchemy.orm import Session
 # 절대 경로로 import 수정
 from core.database import User, APIToken, get_db
 import bcrypt
+from cachetools import TTLCache
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    # argon2id: 메모리 64MB, 4개 레인을 병렬로 계산
+    _password_hasher = PasswordHasher(time_cost=2, memory_cost=2**16, parallelism=4)
+except ImportError:
+    # argon2-cffi 미설치 시 bcrypt만 사용
+    _password_hasher = None
 
 import logging
 logger = logging.getLogger(__name__)
@@ -23,6 +34,33 @@ ACCESS_TOKEN_EXPIRE_HOURS = 24
 # 보안 스키마
 security = HTTPBearer()
 
+# 인증 결과 캐시 (성공한 검증만 저장, 원문 토큰 대신 해시를 키로 사용)
+# - JWT: sha256(token) -> (user_id, exp). exp가 지난 항목은 TTL 이전이라도 사용하지 않음
+# - API 키: sha256(api_key) 16진수 -> token_info. 비활성화 시 즉시 제거하며,
+#   다른 워커 프로세스에서는 최대 TTL(10초)까지 이전 결과가 사용될 수 있음
+AUTH_CACHE_TTL_SECONDS = 10
+_jwt_cache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL_SECONDS)
+_api_key_cache = TTLCache(maxsize=10000, ttl=AUTH_CACHE_TTL_SECONDS)
+_auth_cache_lock = threading.Lock()  # 동기 의존성은 스레드풀에서 실행되므로 잠금 필요
+
+# 사용자 정보 캐시 (user_id / user_uuid 모두 키로 저장)
+_user_cache = TTLCache(maxsize=5000, ttl=60)
+
+def invalidate_user(user_identifier: str):
+    """사용자 정보 캐시에서 해당 사용자를 제거합니다 (user_id 또는 user_uuid)."""
+    with _auth_cache_lock:
+        user_info = _user_cache.pop(user_identifier, None)
+        if user_info:
+            _user_cache.pop(user_info["user_id"], None)
+            _user_cache.pop(user_info["user_uuid"], None)
+            users_db.pop(user_info["user_id"], None)
+    users_db.pop(user_identifier, None)
+
+def invalidate_api_key_cache(api_key_hash: str):
+    """API 키 검증 캐시에서 해당 키를 제거합니다."""
+    with _auth_cache_lock:
+        _api_key_cache.pop(api_key_hash, None)
+
 # 메모리 기반 사용자 및 토큰 저장소 (실제 환경에서는 데이터베이스 사용)
 users_db = {}
 tokens_db = {}
@@ -30,15 +68,33 @@ token_history_db = []
 
 # 패스워드 해시화 함수들
 def hash_password(password: str) -> str:
-    """패스워드를 bcrypt로 해시화"""
+    """패스워드를 argon2id로 해시화 (argon2-cffi 미설치 시 bcrypt)"""
+    if _password_hasher is not None:
+        return _password_hasher.hash(password)
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    """패스워드 검증"""
+    """패스워드 검증 (argon2 / 기존 bcrypt 해시 모두 지원, 비교는 각 라이브러리에서 상수 시간으로 수행)"""
+    if hashed_password.startswith("$argon2"):
+        if _password_hasher is None:
+            logger.error("argon2 해시 검증 불가: argon2-cffi가 설치되지 않음")
+            return False
+        try:
+            return _password_hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """기존 bcrypt 해시이거나 argon2 파라미터가 바뀐 경우 재해시가 필요한지 확인"""
+    if _password_hasher is None:
+        return False
+    if not hashed_password.startswith("$argon2"):
+        return True
+    return _password_hasher.check_needs_rehash(hashed_password)
+
 class TokenManager:
     @staticmethod
     def generate_api_key(user_uuid: str, token_id: str, description: str = "", db: Session = None) -> Dict:
@@ -118,10 +174,19 @@ class TokenManager:
     
     @staticmethod
     def verify_api_key(api_key: str, db: Session = None) -> Optional[Dict]:
-        """API 키 검증 (데이터베이스 우선)"""
+        """API 키 검증 (데이터베이스 우선, 최근 성공 결과는 캐시 사용)
+
+        캐시 적중 시 DB 조회와 last_used_at 갱신을 생략하므로
+        last_used_at은 최대 AUTH_CACHE_TTL_SECONDS 단위로 갱신됩니다.
+        """
         api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
         
         if db is not None:
+            with _auth_cache_lock:
+                cached = _api_key_cache.get(api_key_hash)
+            if cached is not None:
+                return cached
+            
             # 데이터베이스에서 토큰 검증
             db_token = db.query(APIToken).filter(
                 APIToken.token_key == api_key_hash,
@@ -133,7 +198,7 @@ class TokenManager:
                 db_token.last_used_at = datetime.utcnow()
                 db.commit()
                 
-                return {
+                token_info = {
                     "user_uuid": db_token.user_uuid,
                     "token_id": db_token.token_id,
                     "token_name": db_token.token_name,
@@ -141,6 +206,9 @@ class TokenManager:
                     "last_used_at": db_token.last_used_at.isoformat() if db_token.last_used_at else None,
                     "is_active": db_token.is_active
                 }
+                with _auth_cache_lock:
+                    _api_key_cache[api_key_hash] = token_info
+                return token_info
             return None
         
         # 메모리 기반 검증 (하위 호환성)
@@ -165,7 +233,7 @@ class TokenManager:
     def get_user_tokens(user_uuid: str, db: Session = None, is_active: Optional[bool] = None) -> List[Dict]:
         """사용자의 모든 토큰 조회"""
         tokens = []
-        logger.info(f"📋 ㅁㅁㅁㅁㅁㅁㅁㅁㅁ토큰 목록 조회 요청 - user: {user_uuid}, is_active: {is_active}, db : {db}")
+        logger.info("📋 ㅁㅁㅁㅁㅁㅁㅁㅁㅁ토큰 목록 조회 요청 - user: %s, is_active: %s, db : %s", user_uuid, is_active, db)
         if db is not None:
             # 데이터베이스에서 토큰 조회
             db_tokens = db.query(APIToken).filter(
@@ -214,6 +282,7 @@ class TokenManager:
             if db_token:
                 db_token.is_active = False
                 db.commit()
+                invalidate_api_key_cache(db_token.token_key)
                 
                 # 히스토리 저장
                 token_history_db.append({
@@ -258,7 +327,7 @@ class TokenManager:
 
 def authenticate_user(email: str, password: str, db: Session = None) -> Optional[Dict]:
     """사용자 인증 (패스워드 검증)"""
-    print(f"🔍 authenticate_user 호출 - email: {email}")
+    logger.debug("🔍 authenticate_user 호출 - email: %s", email)
     close_db = False
     if db is None:
         db = next(get_db())
@@ -267,13 +336,13 @@ def authenticate_user(email: str, password: str, db: Session = None) -> Optional
     try:
         # 데이터베이스에서 사용자 조회
         user = db.query(User).filter(User.email == email).first()
-        print(f"🔍 사용자 조회 결과: {user is not None}")
+        logger.debug("🔍 사용자 조회 결과: %s", user is not None)
         
         if user:
-            print(f"🔍 사용자 정보: email={user.email}, is_locked={user.is_locked}, failed_attempts={user.failed_login_attempts}")
+            logger.debug("🔍 사용자 정보: email=%s, is_locked=%s, failed_attempts=%s", user.email, user.is_locked, user.failed_login_attempts)
         
         if not user:
-            print(f"🔍 사용자를 찾을 수 없음: {email}")
+            logger.debug("🔍 사용자를 찾을 수 없음: %s", email)
             return None
         
         # 계정 잠금 상태 확인 (None 처리 포함)
@@ -292,28 +361,37 @@ def authenticate_user(email: str, password: str, db: Session = None) -> Optional
         if not verify_password(password, user.password_hash):
             # 로그인 실패 처리
             current_attempts = user.failed_login_attempts or 0
-            print(f"🔍 로그인 실패 - 현재 실패 횟수: {current_attempts}")
+            logger.debug("🔍 로그인 실패 - 현재 실패 횟수: %s", current_attempts)
             user.failed_login_attempts = current_attempts + 1
             user.last_failed_login = datetime.now()
-            print(f"🔍 실패 횟수 증가 후: {user.failed_login_attempts}")
+            logger.debug("🔍 실패 횟수 증가 후: %s", user.failed_login_attempts)
             
             # 5회 실패 시 계정 잠금
             if user.failed_login_attempts >= 5:
                 user.is_locked = True
                 user.locked_at = datetime.now()
-                print(f"🔒 계정 잠금 설정 - is_locked: {user.is_locked}, locked_at: {user.locked_at}")
+                logger.info("🔒 계정 잠금 설정 - email: %s, locked_at: %s", user.email, user.locked_at)
                 db.commit()
-                print(f"🔍 DB 커밋 완료 - 계정 잠금")
+                logger.debug("🔍 DB 커밋 완료 - 계정 잠금")
                 return {"error": "account_locked", "message": "5회 로그인 실패로 계정이 잠겼습니다. 30분 후 다시 시도해주세요."}
             
             db.commit()
-            print(f"🔍 DB 커밋 완료 - 실패 횟수: {user.failed_login_attempts}")
+            logger.debug("🔍 DB 커밋 완료 - 실패 횟수: %s", user.failed_login_attempts)
             return {"error": "invalid_credentials", "message": f"메일 또는 비밀번호를 확인해주세요. (남은 시도: {5 - user.failed_login_attempts}회)"}
         
         # 로그인 성공 시 실패 카운터 초기화 (None 처리 포함)
+        needs_commit = False
         if user.failed_login_attempts and user.failed_login_attempts > 0:
             user.failed_login_attempts = 0
             user.last_failed_login = None
+            needs_commit = True
+        
+        # 기존 bcrypt 해시는 검증에 성공한 시점에 argon2id로 점진적으로 전환
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = hash_password(password)
+            needs_commit = True
+        
+        if needs_commit:
             db.commit()
 
         # 사용자 정보 반환
@@ -329,7 +407,7 @@ def authenticate_user(email: str, password: str, db: Session = None) -> Optional
         }
         
     except Exception as e:
-        print(f"Authentication error: {e}")
+        logger.error("Authentication error: %s", e)
         return None
     finally:
         if close_db:
@@ -349,7 +427,13 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """JWT 토큰 검증"""
+    """JWT 토큰 검증 (최근 검증에 성공한 토큰은 만료 시각 전까지 캐시 사용)"""
+    cache_key = hashlib.sha256(credentials.credentials.encode()).digest()
+    with _auth_cache_lock:
+        cached = _jwt_cache.get(cache_key)
+    if cached is not None and (cached[1] is None or cached[1] > time.time()):
+        return cached[0]
+    
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
@@ -359,6 +443,8 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+        with _auth_cache_lock:
+            _jwt_cache[cache_key] = (user_id, payload.get("exp"))
         return user_id
     except jwt.PyJWTError:
         raise HTTPException(
@@ -367,27 +453,18 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-def verify_api_key_dependency(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """API 키 검증 의존성 (데이터베이스 기반)"""
-    # Bearer 토큰에서 API 키 추출
-    api_key = credentials.credentials
+def resolve_api_key(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> Dict:
+    """API 키를 한 번만 검증하고 결과를 request.state.auth에 저장합니다.
     
-    token_info = TokenManager.verify_api_key(api_key, db)
-    if not token_info:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid API key",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    verify_api_key_dependency / get_token_id_dependency가 같은 요청에서 함께 쓰여도
+    API 키 조회는 한 번만 수행됩니다.
+    """
+    token_info = getattr(request.state, "auth", None)
+    if token_info is not None:
+        return token_info
     
-    return token_info["user_uuid"]
-
-def get_token_id_dependency(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """API 키 검증 의존성 (데이터베이스 기반)"""
     # Bearer 토큰에서 API 키 추출
-    api_key = credentials.credentials
-    
-    token_info = TokenManager.verify_api_key(api_key, db)
+    token_info = TokenManager.verify_api_key(credentials.credentials, db)
     if not token_info:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -395,6 +472,15 @@ def get_token_id_dependency(credentials: HTTPAuthorizationCredentials = Depends(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    request.state.auth = token_info
+    return token_info
+
+def verify_api_key_dependency(token_info: Dict = Depends(resolve_api_key)):
+    """API 키 검증 의존성 (사용자 UUID 반환)"""
+    return token_info["user_uuid"]
+
+def get_token_id_dependency(token_info: Dict = Depends(resolve_api_key)):
+    """API 키 검증 의존성 (토큰 ID 반환)"""
     return token_info["token_id"]
 
 # 사용자 관리 (데이터베이스 기반)
@@ -460,6 +546,12 @@ def get_user(user_identifier: str, db: Session = None) -> Optional[Dict]:
     if user_identifier in users_db:
         return users_db[user_identifier]
     
+    # user_uuid(JWT sub) 기준 조회도 캐시에서 처리
+    with _auth_cache_lock:
+        cached = _user_cache.get(user_identifier)
+    if cached is not None:
+        return cached
+    
     # 데이터베이스에서 조회
     if db is None:
         db = next(get_db())
@@ -484,6 +576,9 @@ def get_user(user_identifier: str, db: Session = None) -> Optional[Dict]:
         }
         # 메모리에도 캐시 (user_id 기준)
         users_db[user.user_id] = user_info
+        with _auth_cache_lock:
+            _user_cache[user.user_id] = user_info
+            _user_cache[user.user_uuid] = user_info
         return user_info
     
     return None
\ No newline at end of file
@@ -1,21 +1,26 @@
-from unicodedata import numeric
 from decimal import Decimal
-from sqlalchemy import Date, ForeignKey, Index, UniqueConstraint, create_engine, Column, Integer, String, DateTime, Text, Boolean, Float, CheckConstraint, NUMERIC, text
-import sqlalchemy
+from sqlalchemy import Date, ForeignKey, Index, UniqueConstraint, create_engine, Column, Integer, String, DateTime, Text, Boolean, Float, CheckConstraint, NUMERIC, text, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.sql import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm.exc import StaleDataError
+import logging
 import os
+import random
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 
+# 한국 시간(KST) - UTC+9
+KST = timezone(timedelta(hours=9))
+
 def generate_request_id():
     """날짜-시간-UUID 형태의 요청 ID를 생성합니다. (한국 시간 기준)"""
     # 한국 시간(KST) 사용 - UTC+9
-    from datetime import timezone, timedelta
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst).strftime("%Y%m%d-%H%M%S")
+    now = datetime.now(KST).strftime("%Y%m%d-%H%M%S")
     unique = uuid.uuid4().hex[:8]
     return f"{now}-{unique}"
 
@@ -29,10 +34,48 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./stt_service.db")
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, echo=True, echo_pool=True)
 else:
-    engine = create_engine(DATABASE_URL, echo=True, echo_pool=True)
+    # 커넥션 풀 설정: 동시 요청 대비 풀 확장, 끊긴 커넥션 사전 감지, 1시간 주기 재생성
+    engine = create_engine(
+        DATABASE_URL,
+        echo=True,
+        echo_pool=True,
+        pool_size=20,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=3600
+    )
     
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진 (음성 변환 경로처럼 async 엔드포인트에서 이벤트 루프를 막지 않도록 사용)
+if DATABASE_URL.startswith("postgresql"):
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql+psycopg2://", "postgresql://", 1).replace("postgresql://", "postgresql+asyncpg://", 1)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+
+# PgBouncer(transaction 풀링 모드) 경유 시 서버 측 prepared statement를 재사용할 수 없으므로 asyncpg 캐시 비활성화
+USE_PGBOUNCER = os.getenv("USE_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+
+try:
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            pool_size=20,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0} if USE_PGBOUNCER else {}
+        )
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+except ImportError:
+    # asyncpg/aiosqlite 미설치 시 비동기 엔진 없이 동작
+    async_engine = None
+    AsyncSessionLocal = None
+
 # Base 클래스
 Base = declarative_base()
 
@@ -65,7 +108,6 @@ class User(Base):
 class TranscriptionRequest(Base):
     """음성 변환 요청 테이블"""
     __tablename__ = "transcription_requests"
-    __table_args__ = {'comment': '음성 파일의 텍스트 변환 요청 정보를 저장하는 테이블'}
     
     # 기본 식별자
     request_id = Column(String(50), primary_key=True, index=True, default=generate_request_id, comment="요청식별자")
@@ -89,12 +131,20 @@ class TranscriptionRequest(Base):
     
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일시")
+    started_at = Column(DateTime(timezone=True), nullable=True, comment="처리시작일시")  # 워커가 작업을 꺼낸 시간 (중단 작업 판별용)
     completed_at = Column(DateTime(timezone=True), nullable=True, comment="완료일시")
     
+    # 제약조건 및 인덱스
+    __table_args__ = (
+        Index('idx_transcription_requests_created_at', created_at.desc()),  # 최신순 조회 최적화
+        Index('idx_transcription_requests_user_created_at', user_uuid, created_at.desc()),  # 사용자별 최신순 조회 최적화
+        Index('idx_transcription_requests_status_created_at', status, created_at.desc()),  # 상태별 최신순 조회 최적화
+        {'comment': '음성 파일의 텍스트 변환 요청 정보를 저장하는 테이블'}
+    )
+    
 class TranscriptionResponse(Base):
     """음성 변환 응답 테이블"""
     __tablename__ = "transcription_responses"
-    __table_args__ = {'comment': '음성 파일의 텍스트 변환 결과를 저장하는 테이블'}
     
     # 기본 정보
     id = Column(Integer, primary_key=True, index=True, comment="응답일련번호")
@@ -118,6 +168,12 @@ class TranscriptionResponse(Base):
     
     # 타임스탬프
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일시")
+    
+    # 제약조건 및 인덱스
+    __table_args__ = (
+        Index('idx_transcription_responses_created_at', created_at.desc()),  # 최신순 조회 최적화
+        {'comment': '음성 파일의 텍스트 변환 결과를 저장하는 테이블'}
+    )
 
 class APIUsageLog(Base):
     """API 사용 로그 테이블 - API 호출 이력과 사용량을 추적하는 테이블
@@ -127,7 +183,6 @@ class APIUsageLog(Base):
     API 사용 패턴 분석과 과금을 위한 데이터를 제공합니다.
     """
     __tablename__ = "api_usage_logs"
-    __table_args__ = {'comment': 'API 호출 이력과 사용량을 추적하는 테이블'}
     
     id = Column(Integer, primary_key=True, index=True, comment="API사용로그일련번호")  # API 사용 로그 고유 식별자 (자동 증가)
     user_uuid = Column(String(36), nullable=True, index=True, comment="사용자고유식별자")  # 요청한 사용자의 UUID (익명 요청시 NULL)
@@ -141,6 +196,15 @@ class APIUsageLog(Base):
     ip_address = Column(String(45), nullable=True, comment="클라이언트IP주소")  # 클라이언트 IP 주소 (IPv4/IPv6 지원)
     user_agent = Column(String(500), nullable=True, comment="사용자에이전트")  # 클라이언트 User-Agent 헤더 정보
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일시")  # API 호출 시간
+    
+    # 제약조건 및 인덱스
+    __table_args__ = (
+        Index('idx_api_usage_logs_created_at', created_at.desc()),  # 최신순/기간별 조회 최적화
+        Index('idx_api_usage_logs_user_created_at', user_uuid, created_at.desc()),  # 사용자별 최신순 조회 최적화
+        Index('idx_api_usage_logs_endpoint_created_at', endpoint, created_at.desc()),  # 엔드포인트별 조회 최적화
+        Index('idx_api_usage_logs_status_created_at', status_code, created_at.desc()),  # 상태코드별 조회 최적화
+        {'comment': 'API 호출 이력과 사용량을 추적하는 테이블'}
+    )
 
 class LoginLog(Base):
     """로그인 로그 테이블 - 사용자 로그인 이력을 추적하는 테이블
@@ -150,7 +214,6 @@ class LoginLog(Base):
     IP 주소와 User-Agent 정보를 통해 접근 환경을 추적할 수 있습니다.
     """
     __tablename__ = "login_logs"
-    __table_args__ = {'comment': '사용자 로그인 이력을 추적하는 테이블'}
     
     id = Column(Integer, primary_key=True, index=True, comment="로그인로그일련번호")  # 로그인 로그 고유 식별자 (자동 증가)
     user_uuid = Column(String(36), nullable=False, index=True, comment="사용자고유식별자")  # 로그인 시도한 사용자의 UUID
@@ -160,6 +223,13 @@ class LoginLog(Base):
     success = Column(Boolean, nullable=False, default=True, comment="로그인성공여부")  # 로그인 성공 여부 (True: 성공, False: 실패)
     failure_reason = Column(String(255), nullable=True, comment="실패사유")  # 로그인 실패 사유 (잘못된 비밀번호, 계정 비활성화 등)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="생성일시")  # 로그 생성 시간
+    
+    # 제약조건 및 인덱스
+    __table_args__ = (
+        Index('idx_login_logs_created_at', created_at.desc()),  # 최신순/기간별 조회 최적화
+        Index('idx_login_logs_user_created_at', user_uuid, created_at.desc()),  # 사용자별 최신순 조회 최적화
+        {'comment': '사용자 로그인 이력을 추적하는 테이블'}
+    )
 
 class APIToken(Base):
     """API 토큰 테이블 - 사용자별 API 인증 토큰을 관리하는 테이블
@@ -192,11 +262,28 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """비동기 데이터베이스 세션 생성 (정상 종료 시 commit, 예외 시 rollback)"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("비동기 DB 드라이버(asyncpg/aiosqlite)가 설치되지 않아 비동기 세션을 만들 수 없습니다.")
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
 # 테이블 생성 함수
 def create_tables():
     """모든 테이블 생성"""
     Base.metadata.create_all(bind=engine)
 
+async def create_tables_async():
+    """모든 테이블 생성 (비동기 엔진 사용)"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
 # 데이터베이스 연결 테스트 함수
 def test_connection():
     """데이터베이스 연결 테스트"""
@@ -209,6 +296,15 @@ def test_connection():
         print(f"Database connection failed: {e}")
         return False
 
+# 테이블 컬럼 메타데이터 캐시 (프로세스 단위)
+_table_columns_cache = {}
+
+def get_table_columns(table_name: str):
+    """테이블 컬럼 정보 조회 (동일 프로세스 내 반복 조회 시 캐시 사용)"""
+    if table_name not in _table_columns_cache:
+        _table_columns_cache[table_name] = inspect(engine).get_columns(table_name)
+    return _table_columns_cache[table_name]
+
 def update_service_token_usage(db, user_uuid: str, token_id: str, tokens_used: float, request_id: str) -> bool:
     """
     서비스 토큰 사용량을 업데이트하고 사용 이력을 기록합니다.
@@ -224,12 +320,6 @@ def update_service_token_usage(db, user_uuid: str, token_id: str, tokens_used: f
     Returns:
         bool: 업데이트 성공 여부
     """
-    import logging
-    from sqlalchemy.exc import IntegrityError, OperationalError
-    from sqlalchemy.orm.exc import StaleDataError
-    import time
-    import random
-    
     logger = logging.getLogger(__name__)
     max_retries = 3
     
@@ -401,12 +491,8 @@ class SubscriptionPlan(Base):
 
 def generate_payment_id():
     """날짜-순번 형태의 결재 번호를 생성합니다. (한국 시간 기준)"""
-    from datetime import timezone, timedelta
-    from sqlalchemy import text
-    
     # 한국 시간(KST) 사용 - UTC+9
-    kst = timezone(timedelta(hours=9))
-    today = datetime.now(kst).strftime("%Y%m%d")
+    today = datetime.now(KST).strftime("%Y%m%d")
     
     # 오늘 날짜의 마지막 순번 조회
     try:
@@ -428,7 +514,6 @@ def generate_payment_id():
         return f"{today}_{next_no:03d}"  # 3자리 순번 (001, 002, ...)
     except:
         # 에러 발생시 기본값
-        import random
         return f"{today}_{random.randint(1, 999):03d}"
 
 class Payment(Base):
@@ -439,7 +524,6 @@ class Payment(Base):
     각 결재는 특정 사용자와 연결되며, 결재 상태와 이력을 추적할 수 있습니다.
     """
     __tablename__ = "payments"
-    __table_args__ = {'comment': '사용자 결재 정보를 관리하는 테이블'}
     
     payment_id = Column(String(50), primary_key=True, index=True, default=generate_payment_id, comment="결재번호")  # 결재번호 (yyyymmdd_nnn 형식)
     user_uuid = Column(String(36), nullable=False, index=True, comment="사용자고유식별자")  # 결재한 사용자의 UUID (User.user_uuid 참조)
@@ -455,6 +539,11 @@ class Payment(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="수정일시")  # 결재 정보 최종 수정 시간
     completed_at = Column(DateTime(timezone=True), nullable=True, comment="완료일시")  # 결재 완료 시간
 
+    __table_args__ = (
+        Index('idx_payments_user_created_at', user_uuid, created_at.desc()),  # 사용자별 최신순 결재 내역 조회 최적화
+        {'comment': '사용자 결재 정보를 관리하는 테이블'}
+    )
+
     # 구독결재내역 ( 결재번호, 단가, 인원수, 금액, 생성일자, 수정일자 )
     # 초과토큰결재내역 ( 결재번호, 토큰수, 분당요금, 초과분당요금, 금액, 생성일자, 수정일자 )
     # 구독결재내역
@@ -515,11 +604,8 @@ class MonthlyBilling(Base):
 
 def generate_monthly_billing_id():
     """월별 빌링 ID를 생성합니다. (YYYYMM-사용자UUID 형식)"""
-    from datetime import datetime, timezone, timedelta
-    
     # 한국 시간(KST) 사용 - UTC+9
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst)
+    now = datetime.now(KST)
     year_month = now.strftime("%Y%m")
     
     return f"BILL-{year_month}"
@@ -585,7 +671,7 @@ class ServiceToken(Base):
     __tablename__ = "service_tokens"
     
     id = Column(Integer, primary_key=True, index=True, comment="서비스토큰일련번호")  # 서비스토큰 고유 식별자 (자동 증가)
-    user_uuid = Column(String(36), ForeignKey('users.user_uuid'), nullable=False, index=True, comment="사용자고유식별자")  # 사용자 UUID (users.user_uuid 참조)
+    user_uuid = Column(String(36), ForeignKey('users.user_uuid'), nullable=False, comment="사용자고유식별자")  # 사용자 UUID (users.user_uuid 참조, 조회는 uq_service_token_user_uuid 사용)
     quota_tokens = Column(NUMERIC(10,2), nullable=False, default=0.0, comment="구독할당토큰")  # 구독할당토큰 (분 단위)
     used_tokens = Column(NUMERIC(10,2), nullable=False, default=0.0, comment="누적사용토큰")  # 누적사용토큰 (분 단위)
     token_expiry_date = Column(Date, nullable=False, comment="토큰종료일자")  # 토큰종료일자
@@ -598,7 +684,7 @@ class ServiceToken(Base):
         CheckConstraint('quota_tokens >= 0', name='check_quota_tokens_positive'),  # 구독할당토큰은 0 이상
         CheckConstraint('used_tokens >= 0', name='check_used_tokens_positive'),  # 누적사용토큰은 0 이상
         CheckConstraint("status IN ('active', 'expired', 'suspended')", name='check_status_valid'),  # 상태 값 제한
-        Index('idx_service_token_user_uuid', 'user_uuid'),  # 사용자별 조회 최적화
+        Index('uq_service_token_user_uuid', 'user_uuid', unique=True),  # 사용자당 1건 (결제 시 UPSERT 충돌 대상)
         Index('idx_service_token_status', 'status'),  # 상태별 조회 최적화
         Index('idx_service_token_expiry', 'token_expiry_date'),  # 만료일별 조회 최적화
         # UniqueConstraint('user_uuid', 'token_id', name='uq_user_token'),  # 사용자별 토큰ID 중복 방지 - token_id 컬럼이 없으므로 주석 처리
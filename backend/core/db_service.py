@@ -1,14 +1,27 @@
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
-from database import TranscriptionRequest, TranscriptionResponse, APIUsageLog
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import TranscriptionRequest, TranscriptionResponse, APIUsageLog, SubscriptionPlan
+from cachetools import TTLCache
 from typing import Optional, Dict, List
-import json
-import time
+import orjson
 import logging
+import threading
 from datetime import datetime, timezone
 
 # Logger 설정
 logger = logging.getLogger(__name__)
 
+# 요금제 조회 캐시 (요금제는 관리자만 드물게 변경하므로 5분 TTL, 변경 시 명시적으로 무효화)
+_plan_cache = TTLCache(maxsize=256, ttl=300)
+_plan_cache_lock = threading.Lock()  # 동기 엔드포인트는 스레드풀에서 실행되므로 잠금 필요
+
+# 활성 요금제 조회 쿼리 (모듈 로드 시 한 번만 구성하고 바인드 파라미터로 실행)
+_SELECT_ACTIVE_PLAN = select(SubscriptionPlan).where(
+    SubscriptionPlan.plan_code == bindparam("plan_code"),
+    SubscriptionPlan.is_active == True
+)
+
 class TranscriptionService:
     """음성 변환 관련 데이터베이스 서비스"""
     
@@ -61,10 +74,44 @@ class TranscriptionService:
                        confidence_score: Optional[float] = None,
                        language_detected: Optional[str] = None) -> TranscriptionResponse:
         """음성 변환 응답을 저장합니다 (새로운 컬럼들 포함)."""
+        response = self._build_response(
+            request_id, transcription_text,
+            summary_text=summary_text,
+            duration=duration,
+            service_provider=service_provider,
+            audio_duration_minutes=audio_duration_minutes,
+            tokens_used=tokens_used,
+            response_data=response_data,
+            confidence_score=confidence_score,
+            language_detected=language_detected
+        )
 
+        try:
+            self.db.add(response)
+            self.db.commit()
+            self.db.refresh(response)
+            logger.info("✅ Response successfully saved to database")
+            return response
+        except Exception as e:
+            logger.error(f"❌ Error saving response to database: {str(e)}")
+            logger.error(f"❌ Error type: {type(e).__name__}")
+            self.db.rollback()
+            raise e
+    
+    @staticmethod
+    def _build_response(request_id: str, transcription_text: str,
+                        summary_text: Optional[str] = None,
+                        duration: float = 0.0,
+                        service_provider: str = "",
+                        audio_duration_minutes: float = 0.0,
+                        tokens_used: float = 0.0,
+                        response_data: Optional[str] = None,
+                        confidence_score: Optional[float] = None,
+                        language_detected: Optional[str] = None) -> TranscriptionResponse:
+        """TranscriptionResponse 객체를 생성합니다 (세션에 추가하지 않음)."""
         word_count = len(transcription_text.split()) if transcription_text else 0
 
-        response = TranscriptionResponse(
+        return TranscriptionResponse(
             request_id=request_id,
             transcribed_text=transcription_text,
             summary_text=summary_text,
@@ -78,18 +125,53 @@ class TranscriptionService:
             tokens_used=tokens_used
         )
 
-        try:
+    def finalize_request(self, request: TranscriptionRequest,
+                         status: str = "completed",
+                         file_path: Optional[str] = None,
+                         response_rid: Optional[str] = None,
+                         error_message: Optional[str] = None,
+                         transcription_text: Optional[str] = None,
+                         **response_fields) -> Optional[TranscriptionResponse]:
+        """요청 완료 처리와 응답 저장을 한 번의 커밋으로 수행합니다.
+
+        update_file_path / update_request_with_rid / complete_request / create_response를
+        각각 커밋하는 대신, create_request가 반환한 요청 객체를 갱신하고
+        응답 행을 함께 추가하여 UPDATE 1회 + INSERT 1회로 처리합니다.
+        transcription_text가 None이면 응답 행은 저장하지 않습니다.
+        이미 completed/failed로 확정된 요청은 덮어쓰지 않고 None을 반환합니다.
+        """
+        if request.status in ("completed", "failed"):
+            logger.warning("⚠️ 이미 완료된 요청 - ID: %s, 상태: %s (요청된 상태: %s 무시)",
+                           request.request_id, request.status, status)
+            self.db.rollback()  # 조회 시 잡은 행 잠금 해제
+            return None
+
+        now = datetime.now(timezone.utc)
+        request.status = status
+        request.completed_at = now
+        if request.created_at:
+            request.processing_time = (now - request.created_at).total_seconds()
+        if file_path is not None:
+            request.filename = file_path
+        if response_rid is not None:
+            request.response_rid = response_rid
+        if error_message:
+            request.error_message = error_message
+
+        response = None
+        if transcription_text is not None:
+            response = self._build_response(request.request_id, transcription_text, **response_fields)
             self.db.add(response)
+
+        try:
             self.db.commit()
-            self.db.refresh(response)
-            logger.info(f"✅ Response successfully saved to database")
+            logger.info("✅ 요청 완료 및 응답 저장 - ID: %s, 상태: %s", request.request_id, status)
             return response
         except Exception as e:
-            logger.error(f"❌ Error saving response to database: {str(e)}")
-            logger.error(f"❌ Error type: {type(e).__name__}")
+            logger.error(f"❌ 요청 완료 처리 실패: {e}")
             self.db.rollback()
-            raise e
-    
+            raise
+
     @staticmethod
     def create_request_static(db: Session, user_uuid: Optional[str], filename: str, 
                       file_size: int, file_extension: str) -> TranscriptionRequest:
@@ -123,7 +205,7 @@ class TranscriptionService:
             if request:
                 request.filename = file_path
                 db.commit()
-                logger.info(f"✅ 파일 경로 업데이트 완료 - ID: {request_id}, Path: {file_path}")
+                logger.info("✅ 파일 경로 업데이트 완료 - ID: %s, Path: %s", request_id, file_path)
                 return True
             else:
                 logger.error(f"❌ 요청을 찾을 수 없음 - ID: {request_id}")
@@ -183,8 +265,10 @@ class TranscriptionService:
             duration = daglo_response["duration"]
         
         # response_data 크기 제한 (최대 50KB)
-        response_data_str = json.dumps(daglo_response, ensure_ascii=False)
-        if len(response_data_str) > 50000:  # 50KB 제한
+        response_data_bytes = orjson.dumps(daglo_response)
+        original_size = len(response_data_bytes)
+        response_data_str = response_data_bytes.decode()
+        if original_size > 50000:  # 50KB 제한
             # 큰 데이터는 요약된 버전만 저장
             simplified_response = {
                 "text": daglo_response.get("text", "")[:1000] + "...(truncated)" if len(daglo_response.get("text", "")) > 1000 else daglo_response.get("text", ""),
@@ -195,8 +279,8 @@ class TranscriptionService:
                 "error": daglo_response.get("error"),
                 "note": "Original response was truncated due to size limit"
             }
-            response_data_str = json.dumps(simplified_response, ensure_ascii=False)
-            logger.warning(f"⚠️ Response data truncated due to size limit. Original size: {len(json.dumps(daglo_response, ensure_ascii=False))} bytes")
+            response_data_str = orjson.dumps(simplified_response).decode()
+            logger.warning(f"⚠️ Response data truncated due to size limit. Original size: {original_size} bytes")
         
         response = TranscriptionResponse(
             request_id=request_id,
@@ -213,7 +297,7 @@ class TranscriptionService:
             db.add(response)
             db.commit()
             db.refresh(response)
-            logger.info(f"✅ Response successfully saved to database")
+            logger.info("✅ Response successfully saved to database")
             return response
         except Exception as e:
             logger.error(f"❌ Error saving response to database: {str(e)}")
@@ -235,15 +319,18 @@ class TranscriptionService:
     
     @staticmethod
     def get_request_with_response(db: Session, request_id: str) -> Optional[Dict]:
-        """요청과 응답을 함께 조회합니다."""
-        request = db.query(TranscriptionRequest).filter(TranscriptionRequest.request_id == request_id).first()
-        if not request:
-            return None
-        
-        response = db.query(TranscriptionResponse).filter(
-            TranscriptionResponse.request_id == request_id
+        """요청과 응답을 함께 조회합니다 (LEFT OUTER JOIN 단일 쿼리)."""
+        row = db.execute(
+            select(TranscriptionRequest, TranscriptionResponse)
+            .outerjoin(TranscriptionResponse, TranscriptionResponse.request_id == TranscriptionRequest.request_id)
+            .where(TranscriptionRequest.request_id == request_id)
+            .order_by(TranscriptionResponse.id)
+            .limit(1)
         ).first()
+        if not row:
+            return None
         
+        request, response = row
         return {
             "request": request,
             "response": response
@@ -362,3 +449,57 @@ class APIUsageService:
         return db.query(APIUsageLog).filter(
             APIUsageLog.user_uuid == user_uuid
         ).order_by(APIUsageLog.created_at.desc()).limit(limit).all()
+
+
+class SubscriptionPlanService:
+    """구독 요금제 조회 서비스 (프로세스 내 TTL 캐시 사용)"""
+
+    @staticmethod
+    def _get_cached(plan_code: str) -> Optional[Dict]:
+        with _plan_cache_lock:
+            return _plan_cache.get(plan_code)
+
+    @staticmethod
+    def _cache_plan(plan: Optional[SubscriptionPlan]) -> Optional[Dict]:
+        """조회한 요금제를 캐시 가능한 dict로 변환하여 저장합니다."""
+        if plan is None:
+            return None
+
+        plan_info = {
+            "plan_code": plan.plan_code,
+            "plan_description": plan.plan_description,
+            "monthly_price": plan.monthly_price,
+            "monthly_service_tokens": plan.monthly_service_tokens,
+            "per_minute_rate": plan.per_minute_rate,
+            "overage_per_minute_rate": plan.overage_per_minute_rate,
+        }
+        with _plan_cache_lock:
+            _plan_cache[plan.plan_code] = plan_info
+        return plan_info
+
+    @staticmethod
+    def get_active_plan(db: Session, plan_code: str) -> Optional[Dict]:
+        """활성 요금제를 코드로 조회합니다. 캐시에 없을 때만 DB를 조회합니다."""
+        cached = SubscriptionPlanService._get_cached(plan_code)
+        if cached is not None:
+            return cached
+        plan = db.execute(_SELECT_ACTIVE_PLAN, {"plan_code": plan_code}).scalar_one_or_none()
+        return SubscriptionPlanService._cache_plan(plan)
+
+    @staticmethod
+    async def get_active_plan_async(db: AsyncSession, plan_code: str) -> Optional[Dict]:
+        """get_active_plan의 AsyncSession 버전"""
+        cached = SubscriptionPlanService._get_cached(plan_code)
+        if cached is not None:
+            return cached
+        plan = (await db.execute(_SELECT_ACTIVE_PLAN, {"plan_code": plan_code})).scalar_one_or_none()
+        return SubscriptionPlanService._cache_plan(plan)
+
+    @staticmethod
+    def invalidate_cache(plan_code: Optional[str] = None):
+        """요금제 등록/수정/삭제 후 호출하여 캐시를 무효화합니다. 코드가 없으면 전체를 비웁니다."""
+        with _plan_cache_lock:
+            if plan_code is None:
+                _plan_cache.clear()
+            else:
+                _plan_cache.pop(plan_code, None)
@@ -1,12 +1,16 @@
-import os
+import asyncio
+import hashlib
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 업로드 파일 복사 청크 크기 (128KB)
+UPLOAD_CHUNK_SIZE = 128 * 1024
+
 class FileStorageManager:
     """
     STT 서비스에서 업로드된 음성 파일을 관리하는 클래스
@@ -20,7 +24,10 @@ class FileStorageManager:
         Args:
             base_storage_path: 기본 저장 경로 (기본값: "stt_storage")
         """
-        self.base_storage_path = Path(base_storage_path)
+        # 작업 디렉토리는 초기화 시 한 번만 조회하고, 기본 경로를 절대 경로로 고정
+        # (이후 Path.absolute() 호출 시 getcwd 시스템 콜이 발생하지 않음)
+        self.working_directory = Path.cwd()
+        self.base_storage_path = self.working_directory / base_storage_path
         self._ensure_base_directory()
     
     def _ensure_base_directory(self):
@@ -96,6 +103,114 @@ class FileStorageManager:
             logger.error(f"   - 파일명: {filename}")
             raise
     
+    def save_audio_stream(self, user_uuid: str, request_id: str, filename: str,
+                          source: BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+        """
+        업로드 스트림(UploadFile.file 등)을 메모리에 모두 읽지 않고 청크 단위로 저장합니다.
+        
+        Args:
+            user_uuid: 사용자 UUID
+            request_id: 요청 ID
+            filename: 원본 파일명
+            source: 읽기 가능한 바이너리 파일 객체
+            chunk_size: 복사 청크 크기 (기본값: 128KB)
+            
+        Returns:
+            str: 저장된 파일의 절대 경로
+            
+        Raises:
+            Exception: 파일 저장 실패 시
+        """
+        try:
+            # 저장 경로 생성
+            file_path = self.get_file_storage_path(user_uuid, request_id, filename)
+            
+            # 디렉토리 생성 (부모 디렉토리까지 모두 생성)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # 청크 단위 복사 (피크 메모리 = 청크 크기)
+            source.seek(0)
+            with open(file_path, 'wb') as f:
+                shutil.copyfileobj(source, f, chunk_size)
+                file_size = f.tell()
+            
+            logger.info(f"💾 음성 파일 저장 완료: {file_path}")
+            logger.info(f"📊 파일 크기: {file_size:,} bytes")
+            
+            return str(file_path.absolute())
+            
+        except Exception as e:
+            logger.error(f"❌ 음성 파일 저장 실패: {e}")
+            logger.error(f"   - 사용자: {user_uuid}")
+            logger.error(f"   - 요청 ID: {request_id}")
+            logger.error(f"   - 파일명: {filename}")
+            raise
+    
+    def save_audio_stream_with_digest(self, user_uuid: str, request_id: str, filename: str,
+                                      source: BinaryIO, chunk_size: int = UPLOAD_CHUNK_SIZE) -> Tuple[str, int, str]:
+        """
+        업로드 스트림을 청크 단위로 저장하면서 파일 크기와 SHA-256 해시를 함께 계산합니다.
+        
+        파일 내용을 한 번만 읽으므로 크기 확인/해시 계산을 위해 전체 바이트를 메모리에 올릴 필요가 없습니다.
+        
+        Args:
+            user_uuid: 사용자 UUID
+            request_id: 요청 ID
+            filename: 원본 파일명
+            source: 읽기 가능한 바이너리 파일 객체
+            chunk_size: 읽기 청크 크기 (기본값: 128KB)
+            
+        Returns:
+            Tuple[str, int, str]: (저장된 파일의 절대 경로, 파일 크기(bytes), SHA-256 hex digest)
+            
+        Raises:
+            Exception: 파일 저장 실패 시
+        """
+        try:
+            # 저장 경로 생성
+            file_path = self.get_file_storage_path(user_uuid, request_id, filename)
+            
+            # 디렉토리 생성 (부모 디렉토리까지 모두 생성)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            # 청크 단위 복사 + 크기/해시 누적 (피크 메모리 = 청크 크기)
+            hasher = hashlib.sha256()
+            file_size = 0
+            source.seek(0)
+            with open(file_path, 'wb') as f:
+                while chunk := source.read(chunk_size):
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    file_size += len(chunk)
+            
+            logger.info(f"💾 음성 파일 저장 완료: {file_path}")
+            logger.info(f"📊 파일 크기: {file_size:,} bytes")
+            
+            return str(file_path), file_size, hasher.hexdigest()
+            
+        except Exception as e:
+            logger.error(f"❌ 음성 파일 저장 실패: {e}")
+            logger.error(f"   - 사용자: {user_uuid}")
+            logger.error(f"   - 요청 ID: {request_id}")
+            logger.error(f"   - 파일명: {filename}")
+            raise
+    
+    def to_relative_path(self, stored_file_path: str) -> str:
+        """
+        저장된 파일의 절대 경로를 작업 디렉토리 기준 상대 경로(POSIX 형식)로 변환합니다.
+        
+        Args:
+            stored_file_path: save_audio_file 등이 반환한 절대 경로
+            
+        Returns:
+            str: 상대 경로 (예: stt_storage/{user_uuid}/{yyyy-mm-dd}/{request_id}/파일명)
+        """
+        try:
+            return Path(stored_file_path).relative_to(self.working_directory).as_posix()
+        except ValueError:
+            # 작업 디렉토리 밖의 경로는 그대로 반환
+            return Path(stored_file_path).as_posix()
+    
     def get_file_path(self, user_uuid: str, request_id: str, filename: str) -> Optional[str]:
         """
         저장된 파일의 경로를 반환합니다.
@@ -238,6 +353,50 @@ def save_uploaded_file(user_uuid: str, request_id: str, filename: str, file_cont
     return file_storage_manager.save_audio_file(user_uuid, request_id, filename, file_content)
 
 
+async def save_uploaded_file_async(user_uuid: str, request_id: str, filename: str, file_content: bytes) -> str:
+    """
+    save_uploaded_file을 스레드에서 실행하는 async 엔드포인트용 편의 함수
+    (동기 디스크 쓰기가 이벤트 루프를 막지 않도록 함)
+    """
+    return await asyncio.to_thread(save_uploaded_file, user_uuid, request_id, filename, file_content)
+
+
+def save_uploaded_stream(user_uuid: str, request_id: str, filename: str, source: BinaryIO) -> str:
+    """
+    업로드 스트림을 청크 단위로 저장하는 편의 함수
+    
+    Args:
+        user_uuid: 사용자 UUID
+        request_id: 요청 ID
+        filename: 파일명
+        source: 업로드 파일 객체 (예: UploadFile.file)
+        
+    Returns:
+        str: 저장된 파일 경로
+    """
+    return file_storage_manager.save_audio_stream(user_uuid, request_id, filename, source)
+
+
+async def save_uploaded_stream_async(user_uuid: str, request_id: str, filename: str,
+                                     source: BinaryIO) -> Tuple[str, int, str]:
+    """
+    업로드 스트림을 스레드에서 청크 단위로 저장하는 async 엔드포인트용 편의 함수
+    (`await file.read()` 대신 UploadFile.file을 그대로 넘겨 파일 전체를 메모리에 올리지 않음)
+    
+    Args:
+        user_uuid: 사용자 UUID
+        request_id: 요청 ID
+        filename: 파일명
+        source: 업로드 파일 객체 (예: UploadFile.file)
+        
+    Returns:
+        Tuple[str, int, str]: (저장된 파일 경로, 파일 크기, SHA-256 hex digest)
+    """
+    return await asyncio.to_thread(
+        file_storage_manager.save_audio_stream_with_digest, user_uuid, request_id, filename, source
+    )
+
+
 def get_stored_file_path(user_uuid: str, request_id: str, filename: str) -> Optional[str]:
     """
     저장된 파일 경로를 조회하는 편의 함수
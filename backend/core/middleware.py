@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+
+from core.database import SessionLocal, APIUsageLog, LoginLog
+
+logger = logging.getLogger(__name__)
+
+# 요청 단위 상관관계 ID (로그 레코드에 자동 주입)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """현재 컨텍스트의 request_id를 로그 레코드에 추가하는 필터
+
+    QueueHandler에 붙여 로그를 생성한 스레드/태스크의 컨텍스트에서 값을 읽습니다.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+# 로그 큐 설정 (배치 크기/대기 시간은 환경변수로 조정 가능)
+LOG_QUEUE_MAXSIZE = 10000
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "200"))
+LOG_FLUSH_INTERVAL = int(os.getenv("LOG_BATCH_MS", "250")) / 1000  # 초
+
+
+def _write_log_batch(batch):
+    """로그 묶음을 모델별 bulk insert로 하나의 트랜잭션에 기록합니다 (스레드풀에서 실행)."""
+    rows_by_model = defaultdict(list)
+    for model, record in batch:
+        rows_by_model[model].append(record)
+
+    db = SessionLocal()
+    try:
+        for model, rows in rows_by_model.items():
+            db.bulk_insert_mappings(model, rows)
+        db.commit()
+    except Exception as log_error:
+        logger.error(f"로그 일괄 기록 실패 ({len(batch)}건): {log_error}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def log_batch_worker(queue: asyncio.Queue):
+    """로그 큐를 비우며 최대 LOG_BATCH_SIZE건씩 모아 일괄 기록합니다.
+
+    첫 레코드 이후 LOG_FLUSH_INTERVAL 동안 추가 레코드를 기다린 뒤 flush 합니다.
+    모으는 도중 취소되면 이미 꺼낸 레코드는 큐에 되돌려 drain_log_queue가 기록하도록 합니다.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + LOG_FLUSH_INTERVAL
+        try:
+            while len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            for item in batch:
+                _put_nowait(queue, item)
+            raise
+        await loop.run_in_executor(None, _write_log_batch, batch)
+
+
+async def drain_log_queue(queue: asyncio.Queue):
+    """종료 시 로그 워커를 멈춘 뒤 큐에 남은 레코드를 모두 기록합니다."""
+    while not queue.empty():
+        batch = []
+        while len(batch) < LOG_BATCH_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        await asyncio.to_thread(_write_log_batch, batch)
+
+
+def _put_nowait(queue: asyncio.Queue, item):
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        logger.warning("로그 큐가 가득 차 로그를 버립니다")
+
+
+def _enqueue_log(app, model, record: dict):
+    """로그 레코드를 큐에 넣습니다. 큐가 없으면 버립니다.
+
+    동기 엔드포인트(스레드풀)에서 호출되면 이벤트 루프 스레드로 넘겨서 넣습니다.
+    """
+    queue = getattr(app.state, "log_queue", None)
+    if queue is None:
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        app.state.log_loop.call_soon_threadsafe(_put_nowait, queue, (model, record))
+    else:
+        _put_nowait(queue, (model, record))
+
+
+def enqueue_api_usage_log(app, record: dict):
+    """API 사용 로그 레코드를 큐에 넣습니다."""
+    _enqueue_log(app, APIUsageLog, record)
+
+
+def enqueue_login_log(app, record: dict):
+    """로그인 로그 레코드를 큐에 넣습니다."""
+    _enqueue_log(app, LoginLog, record)
+
+
+class APIUsageMiddleware:
+    """API 사용 로그 미들웨어 (순수 ASGI 구현)
+
+    BaseHTTPMiddleware와 달리 요청 본문을 메모리에 버퍼링하지 않고,
+    receive/send 메시지가 지나갈 때 크기만 합산합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        request_id = uuid.uuid4().hex
+        request_id_token = request_id_var.set(request_id)
+
+        # 클라이언트 IP / User-Agent는 요청당 한 번만 추출하여 request.state로 공유
+        client = scope.get("client")
+        client_ip = client[0] if client else None
+        user_agent = None
+        for name, value in scope.get("headers") or ():
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["client_ip"] = client_ip
+        state["user_agent"] = user_agent
+
+        request_size = 0
+        response_size = 0
+        status_code = 500
+
+        async def receive_wrapper():
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_size, status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            # GET, POST 요청에 대해서만 로그 기록
+            method = scope["method"]
+            if method in ("GET", "POST"):
+                # 응답을 지연시키지 않도록 DB 기록은 백그라운드 로그 큐로 전달
+                enqueue_api_usage_log(scope["app"], {
+                    "user_uuid": None,  # 미들웨어에서는 사용자 정보를 알 수 없음
+                    "api_key_hash": None,
+                    "endpoint": scope["path"],
+                    "method": method,
+                    "status_code": status_code,
+                    "request_size": request_size,
+                    "response_size": response_size,
+                    "processing_time": time.perf_counter() - start_time,
+                    "ip_address": client_ip,
+                    "user_agent": user_agent
+                })
+            request_id_var.reset(request_id_token)
@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select, func
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
 
-from core.database import get_db
+from core.database import get_db, get_async_db, User, LoginLog
+from core.middleware import enqueue_login_log
 from core.auth import (
     create_access_token,
     authenticate_user,
     verify_token,
     hash_password,
-    verify_password
+    verify_password,
+    invalidate_user
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",
     tags=["인증"]
 )
 
+def _record_login(request: Request, user_uuid: str, success: bool, failure_reason: str = None):
+    """로그인 시도를 로그 큐에 넣습니다 (백그라운드 워커가 일괄 INSERT)."""
+    enqueue_login_log(request.app, {
+        "user_uuid": user_uuid[:36],  # 실패 시 사용자 식별이 안 되면 이메일 기록 (컬럼 길이 제한)
+        "ip_address": getattr(request.state, "client_ip", None),
+        "user_agent": getattr(request.state, "user_agent", None),
+        "success": success,
+        "failure_reason": failure_reason[:255] if failure_reason else None
+    })
+
 class LoginRequest(BaseModel):
     email: str
     password: str
@@ -49,6 +68,7 @@ def login(login_request: LoginRequest, request: Request, db: Session = Depends(g
         user_info = authenticate_user(login_request.email, login_request.password, db)
         
         if not user_info:
+            _record_login(request, login_request.email, False, "Invalid credentials")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="메일 또는 비밀번호를 확인해주세요.",
@@ -57,6 +77,7 @@ def login(login_request: LoginRequest, request: Request, db: Session = Depends(g
         
         # 에러 응답 처리 (계정 잠금 등)
         if isinstance(user_info, dict) and "error" in user_info:
+            _record_login(request, login_request.email, False, user_info["error"])
             if user_info["error"] == "account_locked":
                 raise HTTPException(
                     status_code=status.HTTP_423_LOCKED,
@@ -72,6 +93,7 @@ def login(login_request: LoginRequest, request: Request, db: Session = Depends(g
         access_token = create_access_token(
             data={"sub": user_info["user_uuid"], "email": user_info["email"]}
         )
+        _record_login(request, user_info["user_uuid"], True)
         
         return {
             "access_token": access_token,
@@ -87,19 +109,70 @@ def login(login_request: LoginRequest, request: Request, db: Session = Depends(g
     except HTTPException:
         raise
     except Exception as e:
+        _record_login(request, login_request.email, False, f"System error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="로그인 처리 중 오류가 발생했습니다."
         )
 
 @router.put("/change-password", summary="패스워드 변경")
-def change_password(
+async def change_password(
     password_request: PasswordChangeRequest, 
     current_user: str = Depends(verify_token), 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # 기존 패스워드 변경 로직 이동
-    pass
+    """
+    사용자의 패스워드를 변경합니다.
+    
+    - **current_password**: 현재 패스워드
+    - **new_password**: 새로운 패스워드
+    
+    argon2id 검증/해시 연산은 이벤트 루프를 막지 않도록 스레드에서 수행합니다.
+    """
+    try:
+        logger.info("🔐 패스워드 변경 요청 - 사용자: %s", current_user)
+        
+        # 사용자 정보 조회 (JWT sub = user_uuid)
+        result = await db.execute(select(User).where(User.user_uuid == current_user))
+        user = result.scalar_one_or_none()
+        if not user:
+            logger.warning("⚠️ 사용자를 찾을 수 없음: %s", current_user)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="사용자를 찾을 수 없습니다."
+            )
+        
+        # 현재 패스워드 검증
+        if not await asyncio.to_thread(verify_password, password_request.current_password, user.password_hash):
+            logger.warning("⚠️ 현재 패스워드 불일치 - 사용자: %s", current_user)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="현재 패스워드가 올바르지 않습니다."
+            )
+        
+        # 새 패스워드 해시화 및 업데이트
+        user.password_hash = await asyncio.to_thread(hash_password, password_request.new_password)
+        user.updated_at = datetime.utcnow()
+        await db.commit()
+        invalidate_user(current_user)
+        
+        logger.info("✅ 패스워드 변경 완료 - 사용자: %s", current_user)
+        
+        return {
+            "status": "success",
+            "message": "패스워드가 성공적으로 변경되었습니다.",
+            "user_uuid": current_user,
+            "updated_at": user.updated_at.isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("❌ 패스워드 변경 실패: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="패스워드 변경 중 오류가 발생했습니다."
+        )
 
 @router.post("/unlock-account", summary="계정 잠금 해제")
 def unlock_account(
@@ -108,4 +181,55 @@ def unlock_account(
     db: Session = Depends(get_db)
 ):
     # 기존 계정 잠금 해제 로직 이동
-    pass
\ No newline at end of file
+    pass
+
+@router.get("/login-stats", summary="로그인 통계 조회")
+async def get_login_stats(
+    days: int = Query(30, ge=1, le=365, description="조회 기간 (일)"),
+    current_user: str = Depends(verify_token),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    로그인 통계를 조회합니다.
+    
+    전체/성공/실패 시도 수와 고유 사용자 수를 조건부 집계(FILTER)로 한 번의 쿼리에서 계산합니다.
+    관리자 권한이 필요합니다.
+    """
+    try:
+        # 관리자 권한 확인 (실제 구현 필요)
+        # if not is_admin(current_user):
+        #     raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+        
+        # 기간 설정
+        end_date = datetime.now(timezone.utc)  # timestamptz 비교이므로 aware datetime 사용
+        start_date = end_date - timedelta(days=days)
+        
+        row = (await db.execute(
+            select(
+                func.count().label("total_attempts"),
+                func.count().filter(LoginLog.success.is_(True)).label("successful_logins"),
+                func.count().filter(LoginLog.success.is_(False)).label("failed_logins"),
+                func.count(func.distinct(LoginLog.user_uuid)).filter(LoginLog.success.is_(True)).label("unique_users")
+            ).select_from(LoginLog).where(LoginLog.created_at >= start_date)
+        )).one()
+        
+        # 성공률 계산
+        success_rate = (row.successful_logins / row.total_attempts * 100) if row.total_attempts > 0 else 0
+        
+        return {
+            "status": "success",
+            "period_days": days,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "statistics": {
+                "total_attempts": row.total_attempts,
+                "successful_logins": row.successful_logins,
+                "failed_logins": row.failed_logins,
+                "unique_users": row.unique_users,
+                "success_rate": round(success_rate, 2)
+            }
+        }
+        
+    except Exception:
+        logger.exception("로그인 통계 조회 실패 - 사용자: %s", current_user)
+        raise HTTPException(status_code=500, detail="로그인 통계 조회 중 오류가 발생했습니다.")
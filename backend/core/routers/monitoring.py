@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List, Optional
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 # 절대 경로로 import 수정
-from core.database import get_db, APIUsageLog, TranscriptionRequest
+from core.database import get_async_db, engine, async_engine, APIUsageLog, TranscriptionRequest
 from core.auth import verify_token
 from pydantic import BaseModel
 
@@ -86,7 +87,7 @@ class HealthCheck(BaseModel):
 
 @router.get("/health", summary="시스템 헬스 체크")
 async def health_check(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> HealthCheck:
     """
     시스템의 전반적인 상태를 확인합니다.
@@ -96,7 +97,7 @@ async def health_check(
     try:
         # 데이터베이스 상태 확인
         try:
-            db.execute("SELECT 1")
+            await db.execute(text("SELECT 1"))
             db_status = "healthy"
         except Exception:
             db_status = "unhealthy"
@@ -134,10 +135,24 @@ async def health_check(
             uptime="unknown"
         )
 
+@router.get("/health/db", summary="DB 커넥션 풀 상태")
+async def db_pool_health(current_user: str = Depends(verify_token)) -> Dict[str, Any]:
+    """
+    동기/비동기 엔진의 커넥션 풀 상태를 반환합니다 (풀 고갈 여부 확인용).
+    
+    풀 내부 정보를 노출하므로 인증이 필요합니다.
+    """
+    logger.info(f"🔌 DB 커넥션 풀 상태 조회 - 사용자: {current_user}")
+    return {
+        "sync_pool": engine.pool.status(),
+        "async_pool": async_engine.pool.status() if async_engine is not None else None,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
 @router.get("/stats/system", summary="시스템 통계")
 async def get_system_stats(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> SystemStats:
     """
     시스템 전체 통계를 조회합니다.
@@ -177,7 +192,7 @@ async def get_system_stats(
 @router.get("/stats/user", summary="사용자 통계")
 async def get_user_stats(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days: int = Query(30, description="조회할 일수")
 ) -> UserStats:
     """
@@ -210,10 +225,23 @@ async def get_user_stats(
             detail="사용자 통계 조회 중 오류가 발생했습니다."
         )
 
+# 엔드포인트별 + 전체 API 사용 통계 (단일 조회, 전체 합계 행이 먼저 정렬됨)
+API_USAGE_STATS_SQL = text("""
+    SELECT endpoint,
+           COUNT(*) AS total_calls,
+           COUNT(*) FILTER (WHERE status_code >= 200 AND status_code < 300) AS successful_calls,
+           AVG(processing_time) AS avg_time,
+           MAX(created_at) AS last_called_at
+    FROM api_usage_logs
+    WHERE created_at >= :start_date
+    GROUP BY GROUPING SETS ((endpoint), ())
+    ORDER BY GROUPING(endpoint) DESC, total_calls DESC
+""")
+
 @router.get("/stats/api", summary="API 사용 통계")
 async def get_api_usage_stats(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days: int = Query(7, description="조회할 일수")
 ) -> List[APIUsageStats]:
     """
@@ -221,6 +249,8 @@ async def get_api_usage_stats(
     
     - **days**: 조회할 일수 (기본값: 7일)
     
+    첫 번째 항목(endpoint="*")은 전체 합계입니다.
+    
     관리자 권한이 필요합니다.
     """
     logger.info(f"📊 API 사용 통계 조회 - 사용자: {current_user}, 기간: {days}일")
@@ -230,10 +260,24 @@ async def get_api_usage_stats(
         # if not is_admin(current_user):
         #     raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
         
-        # API 사용 통계 계산 (실제 구현 필요)
-        # api_stats = calculate_api_usage_statistics(days, db)
+        # 전체 합계와 엔드포인트별 통계를 GROUPING SETS로 한 번의 쿼리에서 계산
+        # (전체 합계 행은 endpoint가 NULL로 반환됨)
+        # timestamptz 비교이므로 aware datetime 사용 (naive 값은 asyncpg가 서버 로컬 시간으로 해석)
+        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        result = await db.execute(API_USAGE_STATS_SQL, {"start_date": start_date})
         
-        return []
+        return [
+            APIUsageStats(
+                endpoint=row.endpoint if row.endpoint is not None else "*",
+                total_calls=row.total_calls,
+                successful_calls=row.successful_calls,
+                failed_calls=row.total_calls - row.successful_calls,
+                average_response_time=float(row.avg_time or 0.0),
+                last_called_at=row.last_called_at.isoformat() if row.last_called_at else "",
+                usage_trend=[]
+            )
+            for row in result
+        ]
         
     except HTTPException:
         raise
@@ -247,7 +291,7 @@ async def get_api_usage_stats(
 @router.get("/stats/services", summary="STT 서비스 성능 통계")
 async def get_service_performance(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days: int = Query(7, description="조회할 일수")
 ) -> List[ServicePerformance]:
     """
@@ -273,7 +317,7 @@ async def get_service_performance(
 @router.get("/logs/errors", summary="에러 로그 조회")
 async def get_error_logs(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     level: Optional[str] = Query(None, description="로그 레벨 필터"),
     limit: int = Query(100, description="조회할 로그 수"),
     offset: int = Query(0, description="건너뛸 로그 수")
@@ -311,7 +355,7 @@ async def get_error_logs(
 @router.get("/usage/daily", summary="일별 사용량 통계")
 async def get_daily_usage(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     days: int = Query(30, description="조회할 일수")
 ) -> List[Dict[str, Any]]:
     """
@@ -337,7 +381,7 @@ async def get_daily_usage(
 @router.get("/usage/hourly", summary="시간별 사용량 통계")
 async def get_hourly_usage(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     hours: int = Query(24, description="조회할 시간")
 ) -> List[Dict[str, Any]]:
     """
@@ -363,7 +407,7 @@ async def get_hourly_usage(
 @router.get("/alerts", summary="시스템 알림 조회")
 async def get_system_alerts(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     severity: Optional[str] = Query(None, description="알림 심각도 필터")
 ) -> List[Dict[str, Any]]:
     """
@@ -397,7 +441,7 @@ async def get_system_alerts(
 @router.get("/performance/response-times", summary="응답 시간 통계")
 async def get_response_time_stats(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     endpoint: Optional[str] = Query(None, description="특정 엔드포인트 필터"),
     hours: int = Query(24, description="조회할 시간")
 ) -> Dict[str, Any]:
@@ -433,7 +477,7 @@ async def get_response_time_stats(
 @router.get("/dashboard", summary="모니터링 대시보드 데이터")
 async def get_dashboard_data(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     모니터링 대시보드에 필요한 모든 데이터를 한 번에 조회합니다.
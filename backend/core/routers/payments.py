@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from sqlalchemy import bindparam, func, insert, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from cachetools import TTLCache
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta
 
 # 절대 경로로 import 수정
-from core.database import get_db, User, Payment
+from core.database import (
+    get_async_db, Payment, SubscriptionPayment,
+    ServiceToken, SubscriptionMaster, SubscriptionChangeHistory,
+    generate_payment_id
+)
 from core.auth import verify_token
-from pydantic import BaseModel
+from core.db_service import SubscriptionPlanService
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +27,27 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# 결제 생성 중복 요청 방지 캐시 (클라이언트 재시도 시 같은 결제를 다시 만들지 않고 이전 응답 반환)
+_payment_idempotency_cache = TTLCache(maxsize=10000, ttl=120)
+_IDEMPOTENCY_IN_PROGRESS = object()  # 처리 중인 요청 표시
+
+# 결제 단건 조회 쿼리는 모듈 로드 시 한 번만 구성하고 바인드 파라미터로 실행
+_SELECT_USER_PAYMENT = select(Payment).where(
+    Payment.payment_id == bindparam("payment_id"),
+    Payment.user_uuid == bindparam("user_uuid")
+)
+
 # Pydantic 모델들
 class PaymentCreate(BaseModel):
-    """결제 생성 요청 모델"""
-    amount: float
-    currency: str = "KRW"
-    payment_method_id: int
-    description: Optional[str] = None
+    """구독 결제 생성 요청 모델"""
+    plan_code: str
+    quantity: int = Field(1, ge=1)  # 인원수 (1명 이상)
+    payment_method: Optional[str] = None
+    payment_type: str = "subscription"
+    external_payment_id: Optional[str] = None
+
+# 타임스탬프는 DB에서 ISO 8601 문자열로 변환 (행마다 Python isoformat() 호출 생략)
+ISO_TIMESTAMP_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.USTZH:TZM'
 
 class PaymentResponse(BaseModel):
     """결제 응답 모델"""
@@ -62,80 +86,289 @@ class RefundRequest(BaseModel):
     reason: str
     amount: Optional[float] = None  # 부분 환불 시 금액
 
-@router.post("/", summary="결제 생성")
+@router.post("/", summary="구독 결제 생성")
 async def create_payment(
-    payment_data: PaymentCreate,
+    payment: PaymentCreate,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ) -> Dict[str, Any]:
     """
-    새로운 결제를 생성합니다.
+    요금제 코드와 인원수를 입력하여 구독 결제를 생성합니다.
     
-    - **amount**: 결제 금액
-    - **currency**: 통화 (기본값: KRW)
-    - **payment_method_id**: 사용할 결제 수단 ID
-    - **description**: 결제 설명 (선택사항)
+    결제, 구독 결제 상세, 서비스 토큰, 구독 마스터, 구독 변경 이력을
+    하나의 트랜잭션으로 저장하고 마지막에 한 번만 커밋합니다.
+    
+    - **plan_code**: 요금제 코드 (예: BASIC, PREMIUM, ENTERPRISE)
+    - **quantity**: 인원수 (기본값: 1)
+    - **payment_method**: 결제 수단 (선택사항)
+    - **payment_type**: 결제 구분 (기본값: subscription)
+    - **external_payment_id**: 외부 결제 시스템 ID (선택사항)
+    
+    `Idempotency-Key` 헤더가 같은 재시도 요청은 2분 동안 새 결제를 만들지 않고
+    이전 응답을 그대로 반환합니다. 헤더가 없으면 중복 확인을 하지 않습니다.
     """
-    logger.info(f"🚀 결제 생성 요청 - 사용자: {current_user}, 금액: {payment_data.amount}")
+    # 중복 요청 확인 (이벤트 루프 스레드에서만 접근하므로 잠금 불필요)
+    dedup_key = f"pay:{current_user}:{idempotency_key}" if idempotency_key else None
+    if dedup_key:
+        previous = _payment_idempotency_cache.get(dedup_key)
+        if previous is _IDEMPOTENCY_IN_PROGRESS:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="동일한 결제 요청이 처리 중입니다.")
+        if previous is not None:
+            logger.info("♻️ 중복 결제 요청 - 이전 응답 반환: %s", previous["data"]["payment_id"])
+            return previous
+        _payment_idempotency_cache[dedup_key] = _IDEMPOTENCY_IN_PROGRESS
     
+    succeeded = False
     try:
-        # 결제 수단 확인
-        # PaymentMethod 모델이 없으므로 임시로 주석 처리
-        # payment_method = db.query(PaymentMethod).filter(
-        #     PaymentMethod.id == payment_data.payment_method_id,
-        #     PaymentMethod.user_uuid == current_user,
-        #     PaymentMethod.is_active == True
-        # ).first()
-        payment_method = None  # 임시 처리
+        # JWT sub에 user_uuid가 들어 있으므로 사용자 조회 없이 그대로 사용
+        user_uuid = current_user
         
-        if not payment_method:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="결제 수단을 찾을 수 없습니다."
-            )
+        logger.info("🚀 구독 결제 생성 시작 - 사용자: %s, 요금제: %s, 인원수: %s", user_uuid, payment.plan_code, payment.quantity)
         
-        # 결제 처리 로직 (실제 구현 필요)
-        # payment_result = process_payment(payment_data, payment_method, current_user)
+        # 요금제 정보 조회 (캐시 우선)
+        subscription_plan = await SubscriptionPlanService.get_active_plan_async(db, payment.plan_code)
         
-        logger.info(f"🚀 결제 생성 완료 - 사용자: {current_user}")
-        return {
-            "status": "success",
-            "message": "결제가 성공적으로 처리되었습니다.",
-            "payment_id": "generated_payment_id",
-            "transaction_id": "generated_transaction_id"
+        if not subscription_plan:
+            logger.warning("⚠️ 요금제를 찾을 수 없음 - 코드: %s", payment.plan_code)
+            raise HTTPException(status_code=404, detail=f"요금제 코드 '{payment.plan_code}'를 찾을 수 없거나 비활성화되었습니다.")
+        
+        # 금액 계산
+        unit_price = subscription_plan["monthly_price"]  # 단가 (월 구독 금액)
+        supply_amount = unit_price * payment.quantity  # 공급가액 = 단가 × 인원수
+        vat_amount = int(supply_amount * 0.1)  # 부가세 10%
+        total_amount = supply_amount + vat_amount  # 총 금액
+        
+        logger.info("💰 금액 계산 완료 - 단가: %s원, 공급가액: %s원, 부가세: %s원, 총액: %s원", unit_price, supply_amount, vat_amount, total_amount)
+        
+        # 시각/식별자는 DB 작업 전에 한 번만 계산
+        now = datetime.now()
+        today = now.date()
+        payment_id = await asyncio.to_thread(generate_payment_id)  # 동기 엔진으로 순번을 조회하므로 스레드풀에서 실행
+        subscription_uuid = uuid.uuid4()  # 구독ID와 변경ID 접미사에 함께 사용 (난수 생성 1회)
+        subscription_id = str(subscription_uuid)
+        change_id = f"CHG_{current_user}_{int(now.timestamp())}_{subscription_uuid.hex[:8]}"
+        token_id = f"TOKEN_{payment_id}"
+        
+        # 새 결제 생성 (RETURNING으로 서버 기본값을 함께 받아 별도 refresh 조회 생략)
+        payment_status, created_at = (await db.execute(
+            insert(Payment).values(
+                payment_id=payment_id,
+                user_uuid=user_uuid,
+                plan_code=payment.plan_code,
+                supply_amount=supply_amount,
+                vat_amount=vat_amount,
+                total_amount=total_amount,
+                payment_method=payment.payment_method,
+                payment_type=payment.payment_type,
+                external_payment_id=payment.external_payment_id
+            ).returning(Payment.payment_status, Payment.created_at)
+        )).one()
+        
+        # 구독 결제 상세 정보 생성
+        await db.execute(insert(SubscriptionPayment).values(
+            payment_id=payment_id,
+            plan_code=payment.plan_code,
+            unit_price=unit_price,
+            quantity=payment.quantity,
+            amount=supply_amount
+        ))
+        
+        # 서비스 토큰 생성 (구독할당토큰 = 월제공서비스토큰수 × 인원수, 만료일은 결제일로부터 1개월 후)
+        quota_tokens = subscription_plan["monthly_service_tokens"] * payment.quantity
+        token_expiry_date = today + timedelta(days=30)
+        
+        # 서비스 토큰 UPSERT (사용자당 1건, 기존 토큰은 새 할당량으로 덮어씀)
+        token_values = {
+            "quota_tokens": quota_tokens,
+            "used_tokens": 0.0,  # 초기값은 0으로 설정
+            "token_expiry_date": token_expiry_date,
+            "status": 'active'
+        }
+        token_upsert = pg_insert(ServiceToken).values(user_uuid=user_uuid, **token_values)
+        await db.execute(token_upsert.on_conflict_do_update(
+            index_elements=['user_uuid'],
+            set_={**token_values, "updated_at": func.now()}
+        ))
+        
+        # 구독 마스터 UPSERT (user_uuid 유니크, 기존 구독은 새 구독으로 덮어씀)
+        subscription_start_date = today
+        subscription_end_date = subscription_start_date + timedelta(days=30)  # 1개월 후
+        next_billing_date = subscription_end_date
+        
+        subscription_values = {
+            "subscription_id": subscription_id,
+            "plan_code": payment.plan_code,
+            "unit_price": unit_price,
+            "quantity": payment.quantity,
+            "amount": supply_amount,
+            "quota_tokens": quota_tokens,
+            "subscription_status": 'active',
+            "subscription_start_date": subscription_start_date,
+            "subscription_end_date": subscription_end_date,
+            "next_billing_date": next_billing_date,
+            "auto_renewal": True,
+            "renewal_plan_code": payment.plan_code
         }
+        subscription_upsert = pg_insert(SubscriptionMaster).values(user_uuid=user_uuid, **subscription_values)
+        await db.execute(subscription_upsert.on_conflict_do_update(
+            index_elements=['user_uuid'],
+            set_={**subscription_values, "updated_at": func.now()}
+        ))
+        
+        # 구독 변경 이력 생성 (신규 구독)
+        await db.execute(insert(SubscriptionChangeHistory).values(
+            user_uuid=user_uuid,
+            subscription_id=subscription_id,
+            change_id=change_id,
+            change_type='create',
+            change_reason='신규 구독 생성',
+            previous_plan_code=None,
+            new_plan_code=payment.plan_code,
+            previous_status=None,
+            new_status='active',
+            effective_date=subscription_start_date,
+            change_requested_at=now,
+            proration_amount=0,
+            refund_amount=0,
+            additional_charge=total_amount,
+            processed_by='system',
+            admin_notes=f"결제ID: {payment_id}를 통한 신규 구독 생성"
+        ))
+        
+        # 모든 변경을 한 번의 커밋으로 반영
+        await db.commit()
+        succeeded = True
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ 결제 생성 실패: {str(e)}")
+        logger.error("❌ 구독 결제 생성 중 오류 발생: %s", e)
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="결제 처리 중 오류가 발생했습니다."
+            detail="구독 결제 생성 중 오류가 발생했습니다."
         )
+    finally:
+        # 취소(CancelledError) 포함 어떤 이유로든 커밋 전에 중단되면 처리 중 표시 해제
+        if dedup_key and not succeeded:
+            _payment_idempotency_cache.pop(dedup_key, None)
+    
+    logger.info(
+        "✅ 구독 결제, 서비스 토큰, 구독 마스터 생성 완료 - 결제번호: %s, 토큰ID: %s, 할당토큰: %s, 구독ID: %s, 구독기간: %s ~ %s",
+        payment_id, token_id, quota_tokens, subscription_id, subscription_start_date, subscription_end_date
+    )
+    
+    # 응답은 커밋 이후 미리 계산한 스칼라 값만으로 구성
+    response = {
+        "status": "success",
+        "message": "구독 결제, 서비스 토큰 및 구독 마스터가 성공적으로 생성되었습니다.",
+        "data": {
+            "payment_id": payment_id,
+            "user_uuid": user_uuid,
+            "plan_code": payment.plan_code,
+            "plan_description": subscription_plan["plan_description"],
+            "unit_price": unit_price,
+            "quantity": payment.quantity,
+            "supply_amount": supply_amount,
+            "vat_amount": vat_amount,
+            "total_amount": total_amount,
+            "payment_status": payment_status,
+            "service_token": {
+                "token_id": token_id,
+                "quota_tokens": quota_tokens,
+                "token_expiry_date": token_expiry_date.isoformat(),
+                "status": "active"
+            },
+            "subscription": {
+                "subscription_id": subscription_id,
+                "subscription_status": "active",
+                "subscription_start_date": subscription_start_date.isoformat(),
+                "subscription_end_date": subscription_end_date.isoformat(),
+                "next_billing_date": next_billing_date.isoformat(),
+                "auto_renewal": True,
+                "renewal_plan_code": payment.plan_code
+            },
+            "created_at": created_at.isoformat()
+        }
+    }
+    if dedup_key:
+        _payment_idempotency_cache[dedup_key] = response
+    return response
 
 @router.get("/", summary="결제 내역 조회")
 async def get_payments(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status_filter: Optional[str] = Query(None, description="결제 상태 필터"),
-    limit: int = Query(20, description="조회할 결제 수"),
-    offset: int = Query(0, description="건너뛸 결제 수")
-) -> List[PaymentResponse]:
+    limit: int = Query(20, ge=1, le=100, description="조회할 결제 수"),
+    before: Optional[datetime] = Query(None, description="이 생성일시 이전 결제만 조회 (이전 페이지 마지막 항목의 created_at)"),
+    before_id: Optional[str] = Query(None, description="생성일시가 같은 결제의 구분용 결제번호 (이전 페이지 마지막 항목의 payment_id)")
+) -> Response:
     """
-    현재 사용자의 결제 내역을 조회합니다.
+    현재 사용자의 결제 내역을 최신순으로 조회합니다.
+    
+    OFFSET 대신 (created_at, payment_id) 키셋 페이지네이션을 사용합니다.
+    다음 페이지는 마지막 항목의 created_at / payment_id를 before / before_id로 함께 전달합니다.
     
     - **status_filter**: 결제 상태로 필터링 (pending, completed, failed, refunded)
-    - **limit**: 조회할 결제 수 (기본값: 20)
-    - **offset**: 건너뛸 결제 수 (기본값: 0)
+    - **limit**: 조회할 결제 수 (기본값: 20, 최대 100)
+    - **before**: 이 생성일시 이전 결제만 조회 (before_id 필수)
+    - **before_id**: 생성일시가 같을 때 이 결제번호보다 앞선 결제만 조회
     """
-    logger.info(f"🔍 결제 내역 조회 - 사용자: {current_user}")
+    logger.info("🔍 결제 내역 조회 - 사용자: %s", current_user)
+    
+    # created_at만으로는 같은 시각의 결제가 페이지 경계에서 누락/중복되므로 커서는 쌍으로만 허용
+    if (before is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="before와 before_id는 함께 전달해야 합니다."
+        )
     
     try:
-        # 결제 내역 조회 로직 (실제 구현 필요)
-        # payments = get_user_payments(current_user.user_uuid, status_filter, limit, offset, db)
+        # ORM 객체 대신 필요한 컬럼만 조회
+        query = select(
+            Payment.payment_id,
+            Payment.plan_code,
+            Payment.supply_amount,
+            Payment.vat_amount,
+            Payment.total_amount,
+            Payment.payment_status,
+            Payment.payment_method,
+            Payment.payment_type,
+            Payment.external_payment_id,
+            Payment.created_at,
+            Payment.completed_at
+        ).where(Payment.user_uuid == current_user)
         
-        return []
+        if status_filter:
+            query = query.where(Payment.payment_status == status_filter)
+        
+        # 키셋 조건: idx_payments_user_created_at 인덱스를 따라 이어서 읽음
+        if before is not None:
+            query = query.where(tuple_(Payment.created_at, Payment.payment_id) < tuple_(before, before_id))
+        
+        page = query.order_by(Payment.created_at.desc(), Payment.payment_id.desc()).limit(limit).subquery("p")
+        
+        # 행 객체는 타임스탬프를 ISO 문자열로 변환해 구성하고, 정렬은 원본 타임스탬프 기준으로 집계 안에서 지정
+        # (서브쿼리 순서는 json_agg 입력 순서로 보장되지 않음)
+        payment_json = func.json_build_object(*[
+            arg
+            for column in page.c
+            for arg in (
+                literal_column(f"'{column.name}'"),
+                func.to_char(column, ISO_TIMESTAMP_FORMAT) if column.name in ("created_at", "completed_at") else column
+            )
+        ])
+        
+        # JSON 배열 직렬화를 DB에서 수행하고 결과 문자열을 그대로 응답
+        payments_json = (await db.execute(
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(payment_json, page.c.created_at.desc(), page.c.payment_id.desc())),
+                literal_column("'[]'::json")
+            )).select_from(page)
+        )).scalar_one()
+        return Response(content=payments_json, media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ 결제 내역 조회 실패: {str(e)}")
@@ -146,9 +379,9 @@ async def get_payments(
 
 @router.get("/{payment_id}", summary="결제 상세 조회")
 async def get_payment(
-    payment_id: int,
+    payment_id: str,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> PaymentResponse:
     """
     특정 결제의 상세 정보를 조회합니다.
@@ -157,10 +390,9 @@ async def get_payment(
     
     try:
         # 결제 조회 및 권한 확인
-        payment = db.query(Payment).filter(
-            Payment.payment_id == payment_id,
-            Payment.user_uuid == current_user
-        ).first()
+        payment = (await db.execute(
+            _SELECT_USER_PAYMENT, {"payment_id": payment_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not payment:
             raise HTTPException(
@@ -192,10 +424,10 @@ async def get_payment(
 
 @router.post("/{payment_id}/refund", summary="결제 환불")
 async def refund_payment(
-    payment_id: int,
+    payment_id: str,
     refund_data: RefundRequest,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     결제를 환불 처리합니다.
@@ -203,14 +435,13 @@ async def refund_payment(
     - **reason**: 환불 사유
     - **amount**: 환불 금액 (부분 환불 시, 전액 환불이면 생략)
     """
-    logger.info(f"💰 결제 환불 요청 - ID: {payment_id}, 사용자: {current_user.user_uuid}")
+    logger.info(f"💰 결제 환불 요청 - ID: {payment_id}, 사용자: {current_user}")
     
     try:
         # 결제 조회 및 권한 확인
-        payment = db.query(Payment).filter(
-            Payment.id == payment_id,
-            Payment.user_uuid == current_user.user_uuid
-        ).first()
+        payment = (await db.execute(
+            _SELECT_USER_PAYMENT, {"payment_id": payment_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not payment:
             raise HTTPException(
@@ -248,7 +479,7 @@ async def refund_payment(
 async def create_payment_method(
     method_data: PaymentMethodCreate,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     새로운 결제 수단을 등록합니다.
@@ -285,7 +516,7 @@ async def create_payment_method(
 @router.get("/methods", summary="결제 수단 목록")
 async def get_payment_methods(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[PaymentMethodResponse]:
     """
     현재 사용자의 등록된 결제 수단 목록을 조회합니다.
@@ -310,7 +541,7 @@ async def update_payment_method(
     method_id: int,
     is_default: bool,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     결제 수단 설정을 수정합니다.
@@ -355,7 +586,7 @@ async def update_payment_method(
 async def delete_payment_method(
     method_id: int,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     결제 수단을 삭제합니다.
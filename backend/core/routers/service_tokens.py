@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import delete
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 import logging
@@ -294,21 +295,21 @@ async def delete_service_token(
     logger.info(f"🗑️ 서비스 토큰 삭제 - ID: {token_id}, 사용자: {current_user}")
     
     try:
-        # 서비스 토큰 조회 및 권한 확인
-        service_token = db.query(ServiceToken).filter(
-            ServiceToken.id == token_id,
-            ServiceToken.user_uuid == current_user
-        ).first()
+        # 행을 조회하지 않고 권한 조건을 포함한 DELETE 한 번으로 삭제
+        result = db.execute(
+            delete(ServiceToken).where(
+                ServiceToken.id == token_id,
+                ServiceToken.user_uuid == current_user
+            )
+        )
         
-        if not service_token:
+        if result.rowcount == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="서비스 토큰을 찾을 수 없습니다."
             )
         
-        # 서비스 토큰 삭제 로직 (실제 구현 필요)
-        # delete_service_token_from_db(service_token, db)
-        
+        db.commit()
         logger.info(f"✅ 서비스 토큰 삭제 완료 - ID: {token_id}")
         return {
             "status": "success",
@@ -319,6 +320,7 @@ async def delete_service_token(
         raise
     except Exception as e:
         logger.error(f"❌ 서비스 토큰 삭제 실패: {str(e)}")
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="서비스 토큰 삭제 중 오류가 발생했습니다."
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, List, Optional
 import logging
 from datetime import datetime
 
 # 절대 경로로 import 수정
-from core.database import get_db, User, SubscriptionMaster, SubscriptionPlan
+from core.database import get_async_db, User, SubscriptionMaster, SubscriptionPlan
 from core.auth import verify_token
 from pydantic import BaseModel
 
@@ -17,6 +18,17 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# 자주 쓰는 조회 쿼리는 모듈 로드 시 한 번만 구성하고 바인드 파라미터로 실행
+_SELECT_USER_SUBSCRIPTION = select(SubscriptionMaster).where(
+    SubscriptionMaster.id == bindparam("subscription_id"),
+    SubscriptionMaster.user_uuid == bindparam("user_uuid")
+)
+_SELECT_ACTIVE_SUBSCRIPTION = select(SubscriptionMaster).where(
+    SubscriptionMaster.user_uuid == bindparam("user_uuid"),
+    SubscriptionMaster.subscription_status == "active"
+)
+_SELECT_PLAN_BY_ID = select(SubscriptionPlan).where(SubscriptionPlan.id == bindparam("plan_id"))
+
 # Pydantic 모델들
 class SubscriptionCreate(BaseModel):
     """구독 생성 요청 모델"""
@@ -55,7 +67,7 @@ class SubscriptionChange(BaseModel):
 async def create_subscription(
     subscription_data: SubscriptionCreate,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     새로운 구독을 생성합니다.
@@ -67,10 +79,9 @@ async def create_subscription(
     
     try:
         # 기존 활성 구독 확인
-        existing_subscription = db.query(SubscriptionMaster).filter(
-            SubscriptionMaster.user_uuid == current_user,
-             SubscriptionMaster.subscription_status == "active"
-        ).first()
+        existing_subscription = (await db.execute(
+            _SELECT_ACTIVE_SUBSCRIPTION, {"user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if existing_subscription:
             logger.warning(f"⚠️ 이미 활성 구독 존재 - 사용자: {current_user.user_uuid}")
@@ -80,7 +91,7 @@ async def create_subscription(
             )
         
         # 요금제 존재 확인
-        plan = db.query(SubscriptionPlan).filter(SubscriptionPlan.id == subscription_data.plan_id).first()
+        plan = (await db.execute(_SELECT_PLAN_BY_ID, {"plan_id": subscription_data.plan_id})).scalar_one_or_none()
         if not plan:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -109,7 +120,7 @@ async def create_subscription(
 @router.get("/", summary="구독 목록 조회")
 async def get_subscriptions(
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     status_filter: Optional[str] = Query(None, description="구독 상태 필터")
 ) -> List[SubscriptionResponse]:
     """
@@ -136,7 +147,7 @@ async def get_subscriptions(
 async def get_subscription(
     subscription_id: int,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> SubscriptionResponse:
     """
     특정 구독의 상세 정보를 조회합니다.
@@ -145,10 +156,9 @@ async def get_subscription(
     
     try:
         # 구독 조회 및 권한 확인
-        subscription = db.query(SubscriptionMaster).filter(
-            SubscriptionMaster.id == subscription_id,
-             SubscriptionMaster.user_uuid == current_user
-        ).first()
+        subscription = (await db.execute(
+            _SELECT_USER_SUBSCRIPTION, {"subscription_id": subscription_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not subscription:
             raise HTTPException(
@@ -182,7 +192,7 @@ async def update_subscription(
     subscription_id: int,
     auto_renewal: bool,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     구독 설정을 수정합니다.
@@ -193,10 +203,9 @@ async def update_subscription(
     
     try:
         # 구독 조회 및 권한 확인
-        subscription = db.query(SubscriptionMaster).filter(
-            SubscriptionMaster.id == subscription_id,
-            SubscriptionMaster.user_uuid == current_user
-        ).first()
+        subscription = (await db.execute(
+            _SELECT_USER_SUBSCRIPTION, {"subscription_id": subscription_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not subscription:
             raise HTTPException(
@@ -227,7 +236,7 @@ async def change_subscription(
     subscription_id: int,
     change_data: SubscriptionChange,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     구독 요금제를 변경합니다.
@@ -240,10 +249,9 @@ async def change_subscription(
     
     try:
         # 구독 조회 및 권한 확인
-        subscription = db.query(SubscriptionMaster).filter(
-            SubscriptionMaster.id == subscription_id,
-            SubscriptionMaster.user_uuid == current_user
-        ).first()
+        subscription = (await db.execute(
+            _SELECT_USER_SUBSCRIPTION, {"subscription_id": subscription_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not subscription:
             raise HTTPException(
@@ -252,7 +260,7 @@ async def change_subscription(
             )
         
         # 새 요금제 존재 확인
-        new_plan = db.query(SubscriptionPlan).filter(SubscriptionPlan.id == change_data.new_plan_id).first()
+        new_plan = (await db.execute(_SELECT_PLAN_BY_ID, {"plan_id": change_data.new_plan_id})).scalar_one_or_none()
         if not new_plan:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -282,7 +290,7 @@ async def change_subscription(
 async def get_subscription_history(
     subscription_id: int,
     current_user: str = Depends(verify_token),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> List[Dict[str, Any]]:
     """
     구독의 변경 이력을 조회합니다.
@@ -291,10 +299,9 @@ async def get_subscription_history(
     
     try:
         # 구독 조회 및 권한 확인
-        subscription = db.query(SubscriptionMaster).filter(
-            SubscriptionMaster.id == subscription_id,
-            SubscriptionMaster.user_uuid == current_user
-        ).first()
+        subscription = (await db.execute(
+            _SELECT_USER_SUBSCRIPTION, {"subscription_id": subscription_id, "user_uuid": current_user}
+        )).scalar_one_or_none()
         
         if not subscription:
             raise HTTPException(
@@ -319,9 +326,9 @@ async def get_subscription_history(
 # 구독 요금제 관련 엔드포인트
 @router.get("/plans/", summary="구독 요금제 목록")
 async def get_subscription_plans(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     active_only: bool = Query(True, description="활성 요금제만 조회")
-) -> List[SubscriptionPlanResponse]:
+) -> List[Dict[str, Any]]:
     """
     사용 가능한 구독 요금제 목록을 조회합니다.
     
@@ -330,10 +337,24 @@ async def get_subscription_plans(
     logger.info(f"📋 구독 요금제 목록 조회 - 활성만: {active_only}")
     
     try:
-        # 요금제 목록 조회 로직 (실제 구현 필요)
-        # plans = get_subscription_plans_from_db(active_only, db)
+        # ORM 객체 대신 필요한 컬럼만 Row 튜플로 조회 (타임스탬프는 DB에서 문자열 변환)
+        query = select(
+            SubscriptionPlan.id,
+            SubscriptionPlan.plan_code,
+            SubscriptionPlan.plan_description,
+            SubscriptionPlan.monthly_price,
+            SubscriptionPlan.monthly_service_tokens,
+            SubscriptionPlan.per_minute_rate,
+            SubscriptionPlan.overage_per_minute_rate,
+            SubscriptionPlan.is_active,
+            func.to_char(SubscriptionPlan.created_at, 'YYYY-MM-DD"T"HH24:MI:SS.USTZH:TZM').label("created_at"),
+            func.to_char(SubscriptionPlan.updated_at, 'YYYY-MM-DD"T"HH24:MI:SS.USTZH:TZM').label("updated_at")
+        )
+        if active_only:
+            query = query.where(SubscriptionPlan.is_active == True)
         
-        return []
+        result = await db.execute(query.order_by(SubscriptionPlan.monthly_price))
+        return [row._asdict() for row in result]
         
     except Exception as e:
         logger.error(f"❌ 요금제 목록 조회 실패: {str(e)}")
@@ -1,9 +1,17 @@
-from fastapi import APIRouter, UploadFile, File, Depends, Request
+from fastapi import APIRouter, UploadFile, File, Depends, Request, HTTPException, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+import logging
 
-from core.database import get_db
-from core.auth import verify_service_token, get_token_id_from_token
+from core.database import get_db, get_async_db, TranscriptionRequest, generate_request_id
+from core.auth import verify_api_key_dependency, get_token_id_dependency
+from core.db_service import TranscriptionService
+from core.file_storage import file_storage_manager, save_uploaded_stream_async
+from core.transcription_worker import enqueue_transcription, get_stt_manager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/transcribe",
@@ -17,31 +25,183 @@ async def transcribe_audio(
     service: Optional[str] = None,
     fallback: bool = True,
     summarization: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     # 기존 transcribe_audio 로직 이동
     pass
 
-@router.post("/protected", summary="API 키 인증 음성 변환")
+@router.post("/protected", summary="API 키 인증 음성 변환", status_code=status.HTTP_202_ACCEPTED)
 async def transcribe_audio_protected(
     request: Request,
     file: UploadFile = File(...), 
     service: Optional[str] = None,
     fallback: bool = True,
     summarization: bool = False,
-    current_user: str = Depends(verify_service_token),
-    token_id: str = Depends(get_token_id_from_token),
-    db: Session = Depends(get_db)
+    current_user: str = Depends(verify_api_key_dependency),
+    token_id: str = Depends(get_token_id_dependency),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # 기존 transcribe_audio_protected 로직 이동
-    pass
+    """
+    API 키로 보호된 음성 파일 변환 요청을 접수합니다.
+    Authorization 헤더에 Bearer {api_key} 형식으로 API 키를 전달해야 합니다.
+    
+    파일을 저장하고 변환 작업을 백그라운드 워커 큐에 넣은 뒤 바로 202를 반환합니다.
+    변환 결과는 GET /transcribe/{request_id}로 조회합니다.
+    
+    - **file**: 변환할 음성 파일
+    - **service**: 사용할 STT 서비스 (daglo, tiro, assemblyai, deepgram, fast-whisper). 미지정시 기본 서비스 사용
+    - **fallback**: 실패시 다른 서비스로 폴백 여부 (기본값: True)
+    - **summarization**: ChatGPT API 요약 기능 사용 여부 (기본값: False)
+    """
+    stt_manager = get_stt_manager()
+    if not stt_manager.is_file_supported(file.filename):
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원되지 않는 파일 형식입니다. 지원 형식: {stt_manager.supported_formats_message}"
+        )
+    
+    transcription_queue = getattr(request.app.state, "transcription_queue", None)
+    if transcription_queue is None or transcription_queue.full():
+        raise HTTPException(status_code=503, detail="변환 작업이 많아 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+    
+    # 요청 ID를 먼저 정해 파일 저장 경로와 요청 레코드를 한 번에 구성
+    request_id = generate_request_id()
+    stored_file_path, file_size, _ = await save_uploaded_stream_async(
+        current_user, request_id, file.filename, file.file
+    )
+    
+    request_record = TranscriptionRequest(
+        request_id=request_id,
+        user_uuid=current_user,
+        filename=file_storage_manager.to_relative_path(stored_file_path),
+        file_size=file_size,
+        file_extension=file.filename.rsplit('.', 1)[-1].lower(),
+        service_provider=service,
+        client_ip=request.state.client_ip,
+        status="processing"
+    )
+    db.add(request_record)
+    # 워커가 요청 레코드를 조회할 수 있도록 큐에 넣기 전에 커밋
+    await db.commit()
+    
+    queued = enqueue_transcription(request.app, {
+        "request_id": request_id,
+        "user_uuid": current_user,
+        "token_id": token_id,
+        "file_path": stored_file_path,
+        "filename": file.filename,
+        "service": service,
+        "fallback": fallback,
+        "summarization": summarization
+    })
+    if not queued:
+        request_record.status = "failed"
+        request_record.error_message = "변환 작업 큐 등록 실패"
+        await db.commit()
+        raise HTTPException(status_code=503, detail="변환 작업이 많아 요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+    
+    return {
+        "status": "accepted",
+        "request_id": request_id,
+        "filename": file.filename,
+        "file_size": file_size,
+        "user_uuid": current_user
+    }
 
 @router.get("/history", summary="음성 변환 요청 내역 조회")
-def get_transcription_history(limit: int = 50, db: Session = Depends(get_db)):
-    # 기존 get_transcription_history 로직 이동
-    pass
+def get_transcription_history(
+    limit: int = Query(50, ge=1, le=200, description="조회할 요청 수"),
+    current_user: str = Depends(verify_api_key_dependency),
+    db: Session = Depends(get_db)
+):
+    """
+    API 키 소유자의 음성 변환 요청 내역을 최신순으로 조회합니다.
+    """
+    try:
+        # 읽기 전용 목록이므로 ORM 객체 대신 필요한 컬럼만 튜플로 조회
+        rows = db.execute(
+            select(
+                TranscriptionRequest.request_id,
+                TranscriptionRequest.filename,
+                TranscriptionRequest.file_size,
+                TranscriptionRequest.file_extension,
+                TranscriptionRequest.status,
+                TranscriptionRequest.created_at,
+                TranscriptionRequest.completed_at,
+                TranscriptionRequest.processing_time,
+                TranscriptionRequest.error_message
+            )
+            .where(TranscriptionRequest.user_uuid == current_user)  # idx_transcription_requests_user_created_at 사용
+            .order_by(TranscriptionRequest.created_at.desc())
+            .limit(limit)
+        ).all()
+        
+        result = [
+            {
+                "id": request_id,
+                "filename": filename,
+                "file_size": file_size,
+                "file_extension": file_extension,
+                "status": status,
+                "created_at": created_at.isoformat() if created_at else None,
+                "completed_at": completed_at.isoformat() if completed_at else None,
+                "processing_time": processing_time,
+                "error_message": error_message
+            }
+            for (request_id, filename, file_size, file_extension, status,
+                 created_at, completed_at, processing_time, error_message) in rows
+        ]
+        
+        return {"status": "success", "requests": result}
+    except Exception:
+        logger.exception("음성 변환 요청 내역 조회 실패 - 사용자: %s", current_user)
+        raise HTTPException(status_code=500, detail="요청 내역 조회 중 오류가 발생했습니다.")
 
 @router.get("/{request_id}", summary="특정 음성 변환 요청 상세 조회")
-def get_transcription_detail(request_id: str, db: Session = Depends(get_db)):
-    # 기존 get_transcription_detail 로직 이동
-    pass
\ No newline at end of file
+def get_transcription_detail(
+    request_id: str,
+    current_user: str = Depends(verify_api_key_dependency),
+    db: Session = Depends(get_db)
+):
+    """
+    API 키 소유자의 특정 음성 변환 요청 상세 정보를 조회합니다.
+    """
+    try:
+        result = TranscriptionService.get_request_with_response(db, request_id)
+        # 다른 사용자의 요청은 존재 여부를 드러내지 않도록 404로 응답
+        if not result or result["request"].user_uuid != current_user:
+            raise HTTPException(status_code=404, detail="Request not found")
+        
+        request_data = result["request"]
+        response_data = result["response"]
+        
+        return {
+            "status": "success",
+            "request": {
+                "id": request_data.request_id,
+                "filename": request_data.filename,
+                "file_size": request_data.file_size,
+                "file_extension": request_data.file_extension,
+                "response_rid": request_data.response_rid,
+                "status": request_data.status,
+                "created_at": request_data.created_at.isoformat() if request_data.created_at else None,
+                "completed_at": request_data.completed_at.isoformat() if request_data.completed_at else None,
+                "processing_time": request_data.processing_time,
+                "error_message": request_data.error_message
+            },
+            "response": {
+                "id": response_data.id,
+                "transcribed_text": response_data.transcribed_text,
+                "summary_text": response_data.summary_text,
+                "confidence_score": response_data.confidence_score,
+                "language_detected": response_data.language_detected,
+                "duration": response_data.duration,
+                "word_count": response_data.word_count,
+                "created_at": response_data.created_at.isoformat() if response_data.created_at else None
+            } if response_data else None
+        }
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("음성 변환 요청 상세 조회 실패 - ID: %s", request_id)
+        raise HTTPException(status_code=500, detail="요청 상세 조회 중 오류가 발생했습니다.")
\ No newline at end of file
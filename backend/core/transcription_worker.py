@@ -0,0 +1,272 @@
+import asyncio
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+from pathlib import Path
+
+import orjson
+from sqlalchemy import and_, or_, update
+
+from core.database import SessionLocal, TranscriptionRequest, update_service_token_usage
+from core.db_service import TranscriptionService
+from services.openai_service import OpenAIService
+from services.stt_manager import STTManager
+from utils.audio_utils import resolve_audio_duration
+
+logger = logging.getLogger(__name__)
+
+# 변환 작업 큐 설정 (동시 처리 워커 수/대기 작업 수는 환경변수로 조정 가능)
+TRANSCRIPTION_QUEUE_MAXSIZE = int(os.getenv("TRANSCRIPTION_QUEUE_MAXSIZE", "100"))
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
+# 작업 1건의 STT+요약 최대 처리 시간(초)과 종료 시 남은 작업을 기다리는 최대 시간(초)
+TRANSCRIPTION_JOB_TIMEOUT = float(os.getenv("TRANSCRIPTION_JOB_TIMEOUT", "600"))
+TRANSCRIPTION_SHUTDOWN_TIMEOUT = float(os.getenv("TRANSCRIPTION_SHUTDOWN_TIMEOUT", "30"))
+
+SHUTDOWN_ERROR_MESSAGE = "서버 종료로 변환 작업이 중단되었습니다."
+
+# STT/요약 외 구간(파일 읽기, 재생시간 계산, 결과 저장)에 허용하는 여유 시간(초)
+STALE_GRACE_SECONDS = 300
+
+# 워커가 처리 중인 작업 (request_id → job), 종료 시 실패 처리 대상
+_running_jobs: dict = {}
+
+# 블로킹 STT 호출 전용 스레드풀. 제한 시간이 지나도 스레드는 중단되지 않으므로
+# 기본 실행기(로그 일괄 기록 등이 사용)와 분리하여 멈춘 호출이 다른 작업의 스레드를 점유하지 않게 함
+_stt_executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS, thread_name_prefix="stt")
+
+
+@lru_cache(maxsize=None)
+def get_stt_manager() -> STTManager:
+    """STT 매니저를 최초 사용 시 한 번만 생성합니다 (서비스/모델 초기화 비용)."""
+    return STTManager()
+
+
+@lru_cache(maxsize=None)
+def get_openai_service() -> OpenAIService:
+    """요약용 OpenAI 서비스를 최초 사용 시 한 번만 생성합니다."""
+    return OpenAIService()
+
+
+def _save_transcription_result(job: dict, result: dict, summary_text, duration):
+    """STT 결과를 저장하고 요청을 완료 처리합니다 (스레드풀에서 실행)."""
+    db = SessionLocal()
+    try:
+        # 실패 처리와 동시에 실행되어도 한쪽만 상태를 확정하도록 행 잠금
+        request_record = db.get(TranscriptionRequest, job["request_id"], with_for_update=True)
+        if request_record is None:
+            logger.warning("변환 요청을 찾을 수 없습니다 - ID: %s", job["request_id"])
+            return
+
+        error_message = result.get("error")
+        # 토큰 사용량 계산 (1분당 1점)
+        duration_minutes = round((duration or 0.0) / 60, 2)
+
+        response = TranscriptionService(db).finalize_request(
+            request_record,
+            status="failed" if error_message else "completed",
+            response_rid=result.get("transcript_id") or None,
+            error_message=error_message,
+            transcription_text=result.get("text", ""),
+            summary_text=summary_text,
+            duration=duration or 0.0,
+            service_provider=result.get("service_name", ""),
+            audio_duration_minutes=duration_minutes,
+            tokens_used=duration_minutes,
+            response_data=orjson.dumps(result, default=str).decode(),
+            confidence_score=result.get("confidence"),
+            language_detected=result.get("language_code")
+        )
+
+        # 이미 다른 경로에서 완료/실패 처리된 요청이면 응답이 저장되지 않으므로 사용량도 차감하지 않음
+        if response is None:
+            return
+
+        if not error_message and job["token_id"]:
+            update_service_token_usage(
+                db=db,
+                user_uuid=job["user_uuid"],
+                token_id=job["token_id"],
+                tokens_used=duration_minutes,
+                request_id=job["request_id"]
+            )
+    finally:
+        db.close()
+
+
+def _mark_request_failed(request_id: str, error_message: str):
+    """예외로 중단된 작업의 요청을 실패 상태로 완료 처리합니다 (스레드풀에서 실행)."""
+    db = SessionLocal()
+    try:
+        request_record = db.get(TranscriptionRequest, request_id, with_for_update=True)
+        if request_record is not None:
+            TranscriptionService(db).finalize_request(
+                request_record, status="failed", error_message=error_message
+            )
+    finally:
+        db.close()
+
+
+def _mark_request_started(request_id: str):
+    """워커가 작업을 꺼낸 시각을 기록합니다 (스레드풀에서 실행)."""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(TranscriptionRequest)
+            .where(TranscriptionRequest.request_id == request_id, TranscriptionRequest.status == "processing")
+            .values(started_at=datetime.now(timezone.utc))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _transcribe_and_summarize(job: dict, file_content: bytes):
+    """STT 변환과 요약을 수행합니다 (작업 제한 시간 적용 구간)."""
+    stt_manager = get_stt_manager()
+    loop = asyncio.get_running_loop()
+
+    if job["fallback"]:
+        call = partial(
+            stt_manager.transcribe_with_fallback,
+            file_content, job["filename"], preferred_service=job["service"]
+        )
+    else:
+        call = partial(
+            stt_manager.transcribe_with_service,
+            job["service"] or stt_manager.default_service,
+            file_content,
+            job["filename"]
+        )
+    result = await loop.run_in_executor(_stt_executor, call)
+
+    summary_text = None
+    if job["summarization"] and result.get("text"):
+        summary_text = await get_openai_service().summarize_text(result["text"]) or ""
+    return result, summary_text
+
+
+async def process_transcription_job(job: dict):
+    """큐에서 꺼낸 변환 작업 하나를 처리합니다 (STT → 요약 → 결과 저장)."""
+    await asyncio.to_thread(_mark_request_started, job["request_id"])
+    file_content = await asyncio.to_thread(Path(job["file_path"]).read_bytes)
+
+    result, summary_text = await asyncio.wait_for(
+        _transcribe_and_summarize(job, file_content), TRANSCRIPTION_JOB_TIMEOUT
+    )
+    duration = await resolve_audio_duration(result, file_content, job["filename"])
+
+    # 저장이 시작되면 취소되어도 끝까지 진행하고, 종료 처리는 실패로 덮어쓰지 않고 저장 완료를 기다림
+    job["save_task"] = asyncio.ensure_future(
+        asyncio.to_thread(_save_transcription_result, job, result, summary_text, duration)
+    )
+    await asyncio.shield(job["save_task"])
+
+
+def fail_stale_requests() -> int:
+    """이전 프로세스 종료로 processing 상태에 남은 요청을 실패 처리합니다 (시작 시 스레드풀에서 실행).
+
+    다른 프로세스가 아직 처리 중이거나 큐에 대기 중인 작업은 건드리지 않도록
+    - 시작된 작업: started_at 이후 작업 제한 시간 + 여유 시간이 지난 행
+    - 시작되지 않은 작업: 위 기준에 최대 큐 대기 시간(큐 전체가 제한 시간까지 처리되는 경우)을 더한 행
+    만 대상으로 합니다.
+    """
+    now = datetime.now(timezone.utc)
+    started_deadline = now - timedelta(seconds=TRANSCRIPTION_JOB_TIMEOUT + STALE_GRACE_SECONDS)
+    max_queue_wait = math.ceil(TRANSCRIPTION_QUEUE_MAXSIZE / TRANSCRIPTION_WORKERS) * TRANSCRIPTION_JOB_TIMEOUT
+    queued_deadline = started_deadline - timedelta(seconds=max_queue_wait)
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            update(TranscriptionRequest)
+            .where(
+                TranscriptionRequest.status == "processing",
+                or_(
+                    TranscriptionRequest.started_at < started_deadline,
+                    and_(TranscriptionRequest.started_at.is_(None), TranscriptionRequest.created_at < queued_deadline)
+                )
+            )
+            .values(status="failed", completed_at=now, error_message=SHUTDOWN_ERROR_MESSAGE)
+        )
+        db.commit()
+        return result.rowcount
+    finally:
+        db.close()
+
+
+async def transcription_worker(queue: asyncio.Queue):
+    """변환 작업 큐를 소비하는 워커. 작업 실패는 요청 상태에 기록하고 다음 작업을 계속 처리합니다."""
+    while True:
+        job = await queue.get()
+        _running_jobs[job["request_id"]] = job
+        cancelled = False
+        try:
+            await asyncio.wait_for(process_transcription_job(job), TRANSCRIPTION_JOB_TIMEOUT)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        except Exception as e:
+            logger.exception("변환 작업 실패 - ID: %s", job["request_id"])
+            if isinstance(e, asyncio.TimeoutError):
+                error_message = f"변환 작업 제한 시간({TRANSCRIPTION_JOB_TIMEOUT:.0f}초) 초과"
+            else:
+                error_message = str(e)
+            try:
+                await asyncio.to_thread(_mark_request_failed, job["request_id"], error_message)
+            except Exception:
+                logger.exception("변환 실패 상태 기록 실패 - ID: %s", job["request_id"])
+        finally:
+            # 종료 시 취소된 작업은 shutdown_transcription_workers가 실패 처리하도록 남겨둠
+            if not cancelled:
+                _running_jobs.pop(job["request_id"], None)
+            queue.task_done()
+
+
+async def shutdown_transcription_workers(app, workers: list):
+    """새 작업 접수를 막고 남은 작업을 제한 시간 동안 기다린 뒤, 끝나지 않은 작업은 실패 처리합니다."""
+    queue = app.state.transcription_queue
+    # 이후 enqueue_transcription은 False를 반환하여 요청이 503으로 거절됨
+    app.state.transcription_queue = None
+    try:
+        await asyncio.wait_for(queue.join(), TRANSCRIPTION_SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("변환 작업 종료 대기 시간 초과 - 남은 작업을 실패 처리합니다")
+
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    unfinished = list(_running_jobs.values())
+    _running_jobs.clear()
+    while not queue.empty():
+        unfinished.append(queue.get_nowait())
+        queue.task_done()
+    _stt_executor.shutdown(wait=False, cancel_futures=True)
+
+    # 저장 중이던 작업은 결과 저장을 마치도록 기다림 (실패 처리 대상에서 제외)
+    saving = [job["save_task"] for job in unfinished if "save_task" in job]
+    if saving:
+        await asyncio.gather(*saving, return_exceptions=True)
+    unfinished = [job for job in unfinished if "save_task" not in job]
+
+    # 저장된 음성 파일은 요청 행이 경로를 가지고 있으므로 삭제하지 않음
+    for job in unfinished:
+        try:
+            await asyncio.to_thread(_mark_request_failed, job["request_id"], SHUTDOWN_ERROR_MESSAGE)
+        except Exception:
+            logger.exception("변환 실패 상태 기록 실패 - ID: %s", job["request_id"])
+
+
+def enqueue_transcription(app, job: dict) -> bool:
+    """변환 작업을 큐에 넣습니다. 큐가 없거나 가득 차면 False를 반환합니다."""
+    queue = getattr(app.state, "transcription_queue", None)
+    if queue is None:
+        return False
+    try:
+        queue.put_nowait(job)
+    except asyncio.QueueFull:
+        logger.warning("변환 작업 큐가 가득 찼습니다 - ID: %s", job["request_id"])
+        return False
+    return True
@@ -0,0 +1,28 @@
+"""Add created_at indexes to transcription tables
+
+Revision ID: 9f3b1c2d4e5a
+Revises: c28b8b26b286
+Create Date: 2026-10-16 10:12:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f3b1c2d4e5a'
+down_revision: Union[str, None] = 'c28b8b26b286'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_transcription_requests_created_at', 'transcription_requests', [sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_transcription_responses_created_at', 'transcription_responses', [sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transcription_responses_created_at', table_name='transcription_responses')
+    op.drop_index('idx_transcription_requests_created_at', table_name='transcription_requests')
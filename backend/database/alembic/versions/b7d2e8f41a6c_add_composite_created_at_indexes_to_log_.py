@@ -0,0 +1,40 @@
+"""Add composite created_at indexes to log and request tables
+
+Revision ID: b7d2e8f41a6c
+Revises: 9f3b1c2d4e5a
+Create Date: 2026-10-16 14:03:27.845112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e8f41a6c'
+down_revision: Union[str, None] = '9f3b1c2d4e5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_api_usage_logs_created_at', 'api_usage_logs', [sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_api_usage_logs_user_created_at', 'api_usage_logs', ['user_uuid', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_api_usage_logs_endpoint_created_at', 'api_usage_logs', ['endpoint', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_api_usage_logs_status_created_at', 'api_usage_logs', ['status_code', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_login_logs_created_at', 'login_logs', [sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_login_logs_user_created_at', 'login_logs', ['user_uuid', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_transcription_requests_user_created_at', 'transcription_requests', ['user_uuid', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_transcription_requests_status_created_at', 'transcription_requests', ['status', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transcription_requests_status_created_at', table_name='transcription_requests')
+    op.drop_index('idx_transcription_requests_user_created_at', table_name='transcription_requests')
+    op.drop_index('idx_login_logs_user_created_at', table_name='login_logs')
+    op.drop_index('idx_login_logs_created_at', table_name='login_logs')
+    op.drop_index('idx_api_usage_logs_status_created_at', table_name='api_usage_logs')
+    op.drop_index('idx_api_usage_logs_endpoint_created_at', table_name='api_usage_logs')
+    op.drop_index('idx_api_usage_logs_user_created_at', table_name='api_usage_logs')
+    op.drop_index('idx_api_usage_logs_created_at', table_name='api_usage_logs')
@@ -0,0 +1,33 @@
+"""Add unique user_uuid index to service_tokens
+
+Revision ID: c4e1a9d7b3f2
+Revises: b7d2e8f41a6c
+Create Date: 2026-10-16 15:21:08.417230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1a9d7b3f2'
+down_revision: Union[str, None] = 'b7d2e8f41a6c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 사용자별 최신 토큰만 남기고 중복 행 제거 (유니크 인덱스 생성 전 정리)
+    op.execute("""
+        DELETE FROM service_tokens t
+        USING service_tokens newer
+        WHERE t.user_uuid = newer.user_uuid
+          AND t.id < newer.id
+    """)
+    op.create_index('uq_service_token_user_uuid', 'service_tokens', ['user_uuid'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_service_token_user_uuid', table_name='service_tokens')
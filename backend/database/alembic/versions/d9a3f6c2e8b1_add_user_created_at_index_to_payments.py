@@ -0,0 +1,33 @@
+"""Add user_uuid, created_at composite index to payments
+
+Revision ID: d9a3f6c2e8b1
+Revises: c4e1a9d7b3f2
+Create Date: 2026-10-16 16:02:44.193508
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3f6c2e8b1'
+down_revision: Union[str, None] = 'c4e1a9d7b3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 운영 중 쓰기 잠금을 피하기 위해 트랜잭션 밖에서 CONCURRENTLY로 생성
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_payments_user_created_at', 'payments',
+            ['user_uuid', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_payments_user_created_at', table_name='payments', postgresql_concurrently=True)
@@ -0,0 +1,36 @@
+"""Drop redundant user_uuid indexes from service_tokens
+
+Revision ID: e5b8c3a1f7d4
+Revises: d9a3f6c2e8b1
+Create Date: 2026-10-16 20:41:17.530962
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8c3a1f7d4'
+down_revision: Union[str, None] = 'd9a3f6c2e8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # uq_service_token_user_uuid가 같은 컬럼의 조회를 처리하므로 중복 인덱스 제거
+    # (create_all로 생성된 환경에만 있을 수 있어 존재할 때만 삭제)
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_service_token_user_uuid', table_name='service_tokens',
+                      if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_service_tokens_user_uuid', table_name='service_tokens',
+                      if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_service_tokens_user_uuid', 'service_tokens', ['user_uuid'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
+        op.create_index('idx_service_token_user_uuid', 'service_tokens', ['user_uuid'],
+                        unique=False, if_not_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,27 @@
+"""Add started_at to transcription_requests
+
+Revision ID: f2a7d9c4b6e3
+Revises: e5b8c3a1f7d4
+Create Date: 2026-10-16 21:12:05.284416
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7d9c4b6e3'
+down_revision: Union[str, None] = 'e5b8c3a1f7d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # nullable 컬럼 추가는 테이블 재작성 없이 메타데이터만 변경
+    op.add_column('transcription_requests', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True, comment='처리시작일시'))
+
+
+def downgrade() -> None:
+    op.drop_column('transcription_requests', 'started_at')
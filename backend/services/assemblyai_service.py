@@ -1,9 +1,11 @@
 import os
 import requests
 import time
+import orjson
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from .stt_service_interface import STTServiceInterface
+from utils.log_utils import log_payload_fast
 
 load_dotenv()
 
@@ -59,9 +61,9 @@ class AssemblyAIService(STTServiceInterface):
         )
         
         if response.status_code != 200:
-            raise Exception(f"파일 업로드 실패: {response.status_code} - {response.text}")
+            raise Exception(f"파일 업로드 실패: {response.status_code} - {log_payload_fast(response.content)}")
         
-        return response.json()["upload_url"]
+        return orjson.loads(response.content)["upload_url"]
     
     def submit_transcription(self, audio_url: str, **options) -> str:
         """
@@ -91,9 +93,9 @@ class AssemblyAIService(STTServiceInterface):
         )
         
         if response.status_code != 200:
-            raise Exception(f"변환 작업 제출 실패: {response.status_code} - {response.text}")
+            raise Exception(f"변환 작업 제출 실패: {response.status_code} - {log_payload_fast(response.content)}")
         
-        return response.json()["id"]
+        return orjson.loads(response.content)["id"]
     
     def get_transcription_result(self, transcript_id: str) -> Dict[str, Any]:
         """
@@ -113,9 +115,9 @@ class AssemblyAIService(STTServiceInterface):
         response = requests.get(url, headers=headers)
         
         if response.status_code != 200:
-            raise Exception(f"결과 조회 실패: {response.status_code} - {response.text}")
+            raise Exception(f"결과 조회 실패: {response.status_code} - {log_payload_fast(response.content)}")
         
-        return response.json()
+        return orjson.loads(response.content)
     
     def wait_for_completion(self, transcript_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
         """
@@ -1,13 +1,18 @@
 import os
 import requests
 import time
+import orjson
 import json
+import logging
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from .stt_service_interface import STTServiceInterface
+from utils.log_utils import log_payload_fast
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class DagloService(STTServiceInterface):
     """
     Daglo API를 사용한 음성-텍스트 변환 서비스
@@ -80,9 +85,9 @@ class DagloService(STTServiceInterface):
                 if isinstance(speaker_count_hint, int) and speaker_count_hint > 0:
                     speaker_diarization_config["speakerCountHint"] = speaker_count_hint
                 stt_config["speakerDiarization"] = speaker_diarization_config
-                print(f"🎤 화자 분리 설정 활성화: {json.dumps(stt_config, ensure_ascii=False)}")
+                logger.debug("🎤 화자 분리 설정 활성화: %s", stt_config)
             else:
-                print("🎤 화자 분리 설정 비활성화")
+                logger.debug("🎤 화자 분리 설정 비활성화")
             
             # 파일 확장자 추출
             file_extension = filename.split('.')[-1].lower()
@@ -106,10 +111,10 @@ class DagloService(STTServiceInterface):
             response = requests.post(self.base_url, **post_kwargs)
             
             if response.status_code != 200:
-                raise Exception(f"Daglo API 오류: {response.status_code} - {response.text}")
+                raise Exception(f"Daglo API 오류: {response.status_code} - {log_payload_fast(response.content)}")
             
             # RID 추출
-            upload_result = response.json()
+            upload_result = orjson.loads(response.content)
             rid = upload_result.get('rid')
             
             if not rid:
@@ -123,7 +128,7 @@ class DagloService(STTServiceInterface):
                 result_response = requests.get(result_url, headers=headers)
                 
                 if result_response.status_code == 200:
-                    result_data = result_response.json()
+                    result_data = orjson.loads(result_response.content)
                     status = result_data.get('status')
                     
                     if status == 'transcribed':
@@ -162,7 +167,7 @@ class DagloService(STTServiceInterface):
                         # 아직 처리 중, 10초 대기
                         time.sleep(10)
                 else:
-                    raise Exception(f"결과 조회 실패: {result_response.status_code} - {result_response.text}")
+                    raise Exception(f"결과 조회 실패: {result_response.status_code} - {log_payload_fast(result_response.content)}")
             
             # 최대 시도 횟수 초과
             raise Exception(f"변환 타임아웃 - 최대 시도 횟수({max_attempts}) 초과")
@@ -1,10 +1,12 @@
 import os
 import requests
 import time
+import orjson
 import json
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from .stt_service_interface import STTServiceInterface
+from utils.log_utils import log_payload_fast
 import logging
 
 load_dotenv()
@@ -68,7 +70,7 @@ class DeepgramService(STTServiceInterface):
         start_time = time.time()
         
         try:
-            logger.info(f"🎤 Deepgram 변환 시작 - 파일: {filename}")
+            logger.info("🎤 Deepgram 변환 시작 - 파일: %s", filename)
             
             # 헤더 설정
             headers = {
@@ -107,7 +109,7 @@ class DeepgramService(STTServiceInterface):
             processing_time = time.time() - start_time
             
             if response.status_code != 200:
-                error_msg = f"Deepgram API 오류: {response.status_code} - {response.text}"
+                error_msg = f"Deepgram API 오류: {response.status_code} - {log_payload_fast(response.content)}"
                 logger.error(error_msg)
                 return {
                     "text": "",
@@ -122,7 +124,7 @@ class DeepgramService(STTServiceInterface):
                 }
             
             # 응답 파싱
-            result = response.json()
+            result = orjson.loads(response.content)
             
             # 텍스트 추출
             text = ""
@@ -152,7 +154,7 @@ class DeepgramService(STTServiceInterface):
                 if "detected_language" in metadata:
                     detected_language = metadata["detected_language"]
             
-            logger.info(f"✅ Deepgram 변환 완료 - 길이: {len(text)}자, 신뢰도: {confidence:.2f}")
+            logger.info("✅ Deepgram 변환 완료 - 길이: %s자, 신뢰도: %.2f", len(text), confidence)
             
             return {
                 "text": text,
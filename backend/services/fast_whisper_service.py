@@ -97,7 +97,7 @@ class FastWhisperService(STTServiceInterface):
                 temp_file_path = temp_file.name
                 temp_file.write(file_content)
             
-            logger.info(f"📁 임시 파일 저장 완료: {temp_file_path}")
+            logger.info("📁 임시 파일 저장 완료: %s", temp_file_path)
             
             # 언어 코드 변환 (한국어 처리)
             whisper_language = self._convert_language_code(language_code)
@@ -109,7 +109,7 @@ class FastWhisperService(STTServiceInterface):
             temperature = kwargs.get("temperature", 0.0)
             
             # 음성 변환 실행
-            logger.info(f"🎵 음성 변환 실행 중... (언어: {whisper_language}, 작업: {task})")
+            logger.info("🎵 음성 변환 실행 중... (언어: %s, 작업: %s)", whisper_language, task)
             segments, info = self.model.transcribe(
                 temp_file_path,
                 language=whisper_language,
@@ -134,9 +134,9 @@ class FastWhisperService(STTServiceInterface):
             transcribed_text = transcribed_text.strip()
             processing_time = time.time() - start_time
             
-            logger.info(f"✅ Fast-Whisper 변환 완료 - 처리시간: {processing_time:.2f}초")
-            logger.info(f"📝 변환된 텍스트 길이: {len(transcribed_text)} 문자")
-            logger.info(f"🌍 감지된 언어: {info.language} (확률: {info.language_probability:.2f})")
+            logger.info("✅ Fast-Whisper 변환 완료 - 처리시간: %.2f초", processing_time)
+            logger.info("📝 변환된 텍스트 길이: %s 문자", len(transcribed_text))
+            logger.info("🌍 감지된 언어: %s (확률: %.2f)", info.language, info.language_probability)
             
             return {
                 "text": transcribed_text,
@@ -178,9 +178,9 @@ class FastWhisperService(STTServiceInterface):
             if temp_file_path and os.path.exists(temp_file_path):
                 try:
                     os.unlink(temp_file_path)
-                    logger.info(f"🗑️ 임시 파일 삭제 완료: {temp_file_path}")
+                    logger.info("🗑️ 임시 파일 삭제 완료: %s", temp_file_path)
                 except Exception as cleanup_error:
-                    logger.warning(f"⚠️ 임시 파일 삭제 실패: {str(cleanup_error)}")
+                    logger.warning("⚠️ 임시 파일 삭제 실패: %s", cleanup_error)
     
     def _convert_language_code(self, language_code: str) -> Optional[str]:
         """언어 코드를 Whisper 형식으로 변환합니다."""
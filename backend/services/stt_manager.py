@@ -1,3 +1,4 @@
+import asyncio
 from typing import Dict, Any, List, Optional
 from .stt_service_interface import STTServiceInterface
 from .assemblyai_service import AssemblyAIService
@@ -18,6 +19,13 @@ class STTManager:
         self.services: Dict[str, STTServiceInterface] = {}
         self.default_service = None
         self._initialize_services()
+        # 서비스 구성은 초기화 이후 바뀌지 않으므로 지원 형식을 한 번만 계산
+        self.service_formats: Dict[str, frozenset] = {
+            name: frozenset(fmt.lower() for fmt in service.get_supported_formats())
+            for name, service in self.services.items()
+        }
+        self.all_supported_formats: frozenset = frozenset().union(*self.service_formats.values())
+        self.supported_formats_message = ", ".join(sorted(self.all_supported_formats))
     
     def _initialize_services(self):
         """사용 가능한 STT 서비스들을 초기화합니다."""
@@ -224,7 +232,7 @@ class STTManager:
         
         # 각 서비스를 순서대로 시도
         for service_name in services_to_try:
-            logger.info(f"STT 서비스 시도: {service_name}")
+            logger.info("STT 서비스 시도: %s", service_name)
             
             result = self.transcribe_with_service(
                 service_name=service_name,
@@ -236,12 +244,12 @@ class STTManager:
             
             # 성공한 경우
             if not result.get("error"):
-                logger.info(f"STT 변환 성공: {service_name}")
+                logger.info("STT 변환 성공: %s", service_name)
                 return result
             
             # 실패한 경우 로그 기록
             last_error = result.get("error")
-            logger.warning(f"STT 서비스 {service_name} 실패: {last_error}")
+            logger.warning("STT 서비스 %s 실패: %s", service_name, last_error)
         
         # 모든 서비스 실패
         return {
@@ -256,22 +264,36 @@ class STTManager:
             "error": f"모든 STT 서비스 실패. 마지막 오류: {last_error}"
         }
     
+    async def transcribe_with_fallback_async(
+        self, 
+        file_content: bytes, 
+        filename: str, 
+        language_code: str = "ko",
+        preferred_service: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """transcribe_with_fallback을 스레드에서 실행합니다 (async 엔드포인트용).
+        
+        STT 호출(외부 API 폴링, Fast-Whisper 추론)은 블로킹이므로 이벤트 루프에서 직접 호출하지 않습니다.
+        """
+        return await asyncio.to_thread(
+            self.transcribe_with_fallback,
+            file_content,
+            filename,
+            language_code,
+            preferred_service,
+            **kwargs
+        )
+    
     def is_file_supported(self, filename: str, service_name: Optional[str] = None) -> bool:
         """파일이 지원되는지 확인합니다."""
         file_extension = filename.split('.')[-1].lower()
         
         if service_name:
-            service = self.services.get(service_name)
-            if service:
-                return file_extension in service.get_supported_formats()
-            return False
+            return file_extension in self.service_formats.get(service_name, ())
         
         # 모든 서비스에서 지원하는지 확인
-        for service in self.services.values():
-            if file_extension in service.get_supported_formats():
-                return True
-        
-        return False
+        return file_extension in self.all_supported_formats
     
     def get_supported_formats(self, service_name: Optional[str] = None) -> List[str]:
         """지원되는 파일 형식을 반환합니다."""
@@ -282,11 +304,7 @@ class STTManager:
             return []
         
         # 모든 서비스에서 지원하는 형식들의 합집합
-        all_formats = set()
-        for service in self.services.values():
-            all_formats.update(service.get_supported_formats())
-        
-        return list(all_formats)
+        return list(self.all_supported_formats)
     
     def get_all_supported_formats(self) -> List[str]:
         """모든 서비스에서 지원하는 파일 형식을 반환합니다."""
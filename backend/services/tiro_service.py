@@ -1,6 +1,7 @@
 import os
 import requests
 import time
+import orjson
 import json
 from typing import Dict, Any, List, Optional
 from .stt_service_interface import STTServiceInterface
@@ -202,7 +203,7 @@ class TiroService(STTServiceInterface):
             json=payload
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def upload_file_from_bytes(self, upload_uri: str, file_content: bytes, filename: str):
         """
@@ -215,7 +216,7 @@ class TiroService(STTServiceInterface):
         """
         response = requests.put(upload_uri, data=file_content)
         response.raise_for_status()
-        logger.info(f"File uploaded successfully: {filename}")
+        logger.info("File uploaded successfully: %s", filename)
     
     def notify_upload_complete(self, job_id: str):
         """
@@ -229,7 +230,7 @@ class TiroService(STTServiceInterface):
             headers=self.headers
         )
         response.raise_for_status()
-        logger.info(f"Upload complete notification sent for job: {job_id}")
+        logger.info("Upload complete notification sent for job: %s", job_id)
     
     def poll_job_status(self, job_id: str, max_wait_time: int = 600) -> str:
         """
@@ -256,13 +257,13 @@ class TiroService(STTServiceInterface):
             )
             response.raise_for_status()
             
-            job_data = response.json()
+            job_data = orjson.loads(response.content)
             status = job_data.get("status")
             
-            logger.info(f"Job {job_id} status: {status} (elapsed: {elapsed_time}s)")
+            logger.info("Job %s status: %s (elapsed: %ss)", job_id, status, elapsed_time)
             
             if status in success_statuses:
-                logger.info(f"Job completed successfully with status: {status}")
+                logger.info("Job completed successfully with status: %s", status)
                 return status
             elif status in failure_statuses:
                 logger.error(f"Job failed with status: {status}")
@@ -274,7 +275,7 @@ class TiroService(STTServiceInterface):
             # 지수 백오프 적용
             interval = min(interval * 2, max_interval)
         
-        logger.warning(f"Polling timeout after {max_wait_time} seconds")
+        logger.warning("Polling timeout after %s seconds", max_wait_time)
         return "TIMEOUT"
     
     def get_transcript(self, job_id: str) -> dict:
@@ -292,7 +293,7 @@ class TiroService(STTServiceInterface):
             headers=self.headers
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def get_translations(self, job_id: str) -> list:
         """
@@ -309,7 +310,7 @@ class TiroService(STTServiceInterface):
             headers=self.headers
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     def process_audio_file_from_bytes(
         self, 
@@ -330,7 +331,7 @@ class TiroService(STTServiceInterface):
         Returns:
             dict: 전사 및 번역 결과
         """
-        logger.info(f"Starting audio processing for: {filename}")
+        logger.info("Starting audio processing for: %s", filename)
         
         try:
             # Step 1: 작업 생성
@@ -338,7 +339,7 @@ class TiroService(STTServiceInterface):
             job_id = job_response["id"]
             upload_uri = job_response["uploadUri"]
             
-            logger.info(f"Job created: {job_id}")
+            logger.info("Job created: %s", job_id)
             
             # Step 2: 파일 업로드
             self.upload_file_from_bytes(upload_uri, file_content, filename)
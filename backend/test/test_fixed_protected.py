@@ -65,18 +65,29 @@ def test_fixed_protected_transcribe():
         try:
             response = requests.post(url, files=files, data=data, headers=headers, timeout=120)
             
-            if response.status_code == 200:
-                result = response.json()
-                print("✅ 성공!")
-                print(f"Request ID: {result.get('request_id')}")
-                print(f"Status: {result.get('status')}")
-                print(f"Service Used: {result.get('service_used')}")
-                print(f"Transcription: {result.get('transcription', '')[:100]}...")
-                print(f"Summary: {result.get('summary', '')[:100]}...")
+            # 변환은 백그라운드 워커가 처리하므로 202로 접수된 뒤 상세 조회로 결과를 확인
+            if response.status_code == 202:
+                request_id = response.json().get('request_id')
+                print(f"📥 접수됨 - Request ID: {request_id}")
+                
+                result = wait_for_transcription(request_id, headers)
+                if result is None:
+                    print("⏰ 변환 결과 대기 시간 초과")
+                    return
+                
+                request_info = result["request"]
+                response_info = result["response"] or {}
+                if request_info["status"] == "completed":
+                    print("✅ 성공!")
+                else:
+                    print(f"❌ 변환 실패: {request_info['error_message']}")
+                print(f"Status: {request_info['status']}")
+                print(f"Transcription: {(response_info.get('transcribed_text') or '')[:100]}...")
+                print(f"Summary: {(response_info.get('summary_text') or '')[:100]}...")
                 
                 # 데이터베이스에서 확인
                 print("\n📊 데이터베이스 확인 중...")
-                check_database_record(result.get('request_id'))
+                check_database_record(request_id)
                 
             else:
                 print(f"❌ 오류 - 상태 코드: {response.status_code}")
@@ -87,6 +98,22 @@ def test_fixed_protected_transcribe():
         except Exception as e:
             print(f"❌ 예외 발생: {e}")
 
+def wait_for_transcription(request_id, headers, timeout=300, interval=3):
+    """
+    상세 조회 엔드포인트를 폴링하여 요청이 completed/failed가 되면 결과를 반환합니다.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"http://localhost:8001/transcribe/{request_id}", headers=headers, timeout=30)
+        if response.status_code != 200:
+            print(f"❌ 상세 조회 실패: {response.status_code} - {response.text}")
+            return None
+        result = response.json()
+        if result["request"]["status"] in ("completed", "failed"):
+            return result
+        time.sleep(interval)
+    return None
+
 def check_database_record(request_id):
     """
     데이터베이스에서 해당 request_id의 레코드 확인
@@ -1,5 +1,6 @@
 import requests
 import json
+import time
 
 def test_protected_transcribe():
     """
@@ -21,7 +22,6 @@ def test_protected_transcribe():
     
     # API 키 생성
     headers = {"Authorization": f"Bearer {token}"}
-    import time
     token_id = f"test_token_{int(time.time())}"
     api_key_response = requests.post(f"http://localhost:8001/tokens/{token_id}", headers=headers, params={"description": "Test API key"})
     
@@ -54,10 +54,37 @@ def test_protected_transcribe():
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.text}")
     
-    if response.status_code == 200:
+    # 변환은 백그라운드 워커가 처리하므로 202로 접수된 뒤 상세 조회로 결과를 확인
+    if response.status_code != 202:
+        print(f"❌ 보호된 transcribe 엔드포인트 테스트 실패: {response.status_code}")
+        return
+    
+    request_id = response.json()["request_id"]
+    print(f"✅ 변환 요청 접수 - Request ID: {request_id}")
+    
+    result = wait_for_transcription(request_id, headers)
+    if result is None:
+        print("⏰ 변환 결과 대기 시간 초과")
+    elif result["request"]["status"] == "completed":
         print("✅ 보호된 transcribe 엔드포인트 테스트 성공!")
     else:
-        print(f"❌ 보호된 transcribe 엔드포인트 테스트 실패: {response.status_code}")
+        print(f"❌ 변환 실패: {result['request']['error_message']}")
+
+def wait_for_transcription(request_id, headers, timeout=120, interval=2):
+    """
+    상세 조회 엔드포인트를 폴링하여 요청이 completed/failed가 되면 결과를 반환합니다.
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"http://localhost:8001/transcribe/{request_id}", headers=headers)
+        if response.status_code != 200:
+            print(f"❌ 상세 조회 실패: {response.status_code} - {response.text}")
+            return None
+        result = response.json()
+        if result["request"]["status"] in ("completed", "failed"):
+            return result
+        time.sleep(interval)
+    return None
 
 if __name__ == "__main__":
     test_protected_transcribe()
\ No newline at end of file
@@ -1,8 +1,12 @@
+import asyncio
 import io
 import wave
 import struct
 from typing import Optional
 
+# mutagen으로 재생 시간을 읽는 확장자 (호출마다 리스트를 만들지 않도록 모듈 상수로 고정)
+MUTAGEN_EXTENSIONS = frozenset(('mp3', 'mp4', 'm4a', 'aac', 'ogg', 'flac'))
+
 def get_audio_duration(file_content: bytes, filename: str) -> Optional[float]:
     """
     음성파일의 재생 시간을 계산합니다.
@@ -19,7 +23,7 @@ def get_audio_duration(file_content: bytes, filename: str) -> Optional[float]:
         
         if file_extension == 'wav':
             return _get_wav_duration(file_content)
-        elif file_extension in ['mp3', 'mp4', 'm4a', 'aac', 'ogg', 'flac']:
+        elif file_extension in MUTAGEN_EXTENSIONS:
             # 다른 포맷들은 mutagen 라이브러리 사용
             return _get_duration_with_mutagen(file_content, file_extension)
         else:
@@ -30,6 +34,77 @@ def get_audio_duration(file_content: bytes, filename: str) -> Optional[float]:
         print(f"❌ 오디오 duration 계산 실패: {e}")
         return None
 
+async def get_audio_duration_async(file_content: bytes, filename: str) -> Optional[float]:
+    """
+    get_audio_duration을 스레드에서 실행하여 이벤트 루프를 막지 않도록 합니다.
+    async 엔드포인트에서는 이 함수를 사용합니다.
+    """
+    return await asyncio.to_thread(get_audio_duration, file_content, filename)
+
+async def resolve_audio_duration(transcription_result: dict, file_content: bytes, filename: str) -> Optional[float]:
+    """
+    STT 결과의 audio_duration을 우선 사용하고, 없을 때만 파일을 직접 분석합니다.
+    
+    Daglo, Deepgram, Fast-Whisper는 응답에 재생 시간을 포함하므로 STT 전에
+    get_audio_duration을 미리 호출할 필요가 없습니다. AssemblyAI, Tiro처럼
+    0.0을 반환하는 서비스(또는 폴백 실패)의 경우에만 로컬 계산으로 대체합니다.
+    
+    Args:
+        transcription_result: STT 서비스 변환 결과
+        file_content: 음성 파일의 바이트 데이터
+        filename: 파일명 (확장자 확인용)
+        
+    Returns:
+        float: 재생 시간 (초), 실패시 None
+    """
+    duration = transcription_result.get("audio_duration")
+    if duration:
+        return float(duration)
+    return await get_audio_duration_async(file_content, filename)
+
+def get_audio_duration_from_path(file_path: str) -> Optional[float]:
+    """
+    디스크에 저장된 음성파일의 재생 시간을 계산합니다.
+    
+    wave/mutagen 모두 파일 경로를 직접 읽으므로, 바이트를 메모리에 올리거나
+    임시 파일로 다시 쓸 필요가 없습니다.
+    
+    Args:
+        file_path: 음성 파일 경로
+        
+    Returns:
+        float: 재생 시간 (초), 실패시 None
+    """
+    try:
+        file_extension = file_path.split('.')[-1].lower()
+        
+        if file_extension == 'wav':
+            with wave.open(file_path, 'rb') as wav_file:
+                return wav_file.getnframes() / float(wav_file.getframerate())
+        elif file_extension in MUTAGEN_EXTENSIONS:
+            from mutagen import File as MutagenFile
+            audio_file = MutagenFile(file_path)
+            if audio_file is not None and hasattr(audio_file, 'info'):
+                return audio_file.info.length
+            print(f"⚠️ mutagen으로 파일 정보를 읽을 수 없음: {file_extension}")
+            return None
+        else:
+            print(f"⚠️ 지원하지 않는 오디오 포맷: {file_extension}")
+            return None
+            
+    except ImportError:
+        print("⚠️ mutagen 라이브러리가 설치되지 않음. WAV 파일만 지원됩니다.")
+        return None
+    except Exception as e:
+        print(f"❌ 오디오 duration 계산 실패: {e}")
+        return None
+
+async def get_audio_duration_from_path_async(file_path: str) -> Optional[float]:
+    """
+    get_audio_duration_from_path를 스레드에서 실행합니다 (async 엔드포인트용).
+    """
+    return await asyncio.to_thread(get_audio_duration_from_path, file_path)
+
 def _get_wav_duration(file_content: bytes) -> Optional[float]:
     """
     WAV 파일의 재생 시간을 계산합니다.
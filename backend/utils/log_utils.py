@@ -0,0 +1,32 @@
+import os
+from typing import Any
+
+import orjson
+
+# 로그에 남길 페이로드 최대 크기 (바이트)
+LOG_DETAIL_MAX_BYTES = int(os.getenv("LOG_DETAIL_MAX_BYTES", "4096"))
+
+def log_payload_fast(obj: Any, max_bytes: int = LOG_DETAIL_MAX_BYTES) -> str:
+    """
+    로그용 페이로드 문자열을 만들고 max_bytes를 넘으면 잘라냅니다.
+    
+    dict/list 등은 들여쓰기 없이 orjson으로 직렬화하고, bytes는 그대로 디코딩합니다
+    (requests의 response.text처럼 인코딩 추정을 하지 않음).
+    
+    Args:
+        obj: 로그에 남길 객체 (bytes, str, dict, list 등)
+        max_bytes: 최대 바이트 수 (기본값: LOG_DETAIL_MAX_BYTES)
+        
+    Returns:
+        str: 로그용 문자열 (잘린 경우 원본 크기 표시)
+    """
+    if isinstance(obj, (bytes, bytearray)):
+        buf = bytes(obj)
+    elif isinstance(obj, str):
+        buf = obj.encode("utf-8", "replace")
+    else:
+        buf = orjson.dumps(obj, default=str)
+    
+    if len(buf) <= max_bytes:
+        return buf.decode("utf-8", "replace")
+    return f"{buf[:max_bytes].decode('utf-8', 'ignore')}… ({len(buf):,} bytes)"